@@ -0,0 +1,70 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+SCENARIOS = {
+    "package": "import mathjson2qubo",
+    "validator": (
+        "from mathjson2qubo import Validator\n"
+        "Validator([{'symbol': 'x', 'dimension': 1, 'size': 4, 'type': 'BINARY'}])"
+        ".validate_mathjson({'sym': 'x', 'sub': {'num': 1}})"
+    ),
+    "parser": "from mathjson2qubo import Parser",
+}
+
+# the package is imported from the checkout, whatever the current directory is
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TIMER = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "exec(sys.argv[1])\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(elapsed, 'pyqubo' in sys.modules)\n"
+)
+
+
+def measure(code: str, repeat: int):
+    timings = []
+    loaded = False
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER, code],
+            cwd=ROOT,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        timings.append(float(output[0]))
+        loaded = output[1] == "True"
+    return timings, loaded
+
+
+def main():
+    argparser = argparse.ArgumentParser(
+        description="measure mathjson2qubo import time in fresh interpreters."
+    )
+    argparser.add_argument("--repeat", type=int, default=5)
+    args = argparser.parse_args()
+
+    print(
+        "{:<10} {:>12} {:>12} {:>8}".format(
+            "scenario", "median[ms]", "min[ms]", "pyqubo"
+        )
+    )
+    for name, code in SCENARIOS.items():
+        timings, loaded = measure(code, args.repeat)
+        print(
+            "{:<10} {:>12.2f} {:>12.2f} {:>8}".format(
+                name,
+                statistics.median(timings) * 1000,
+                min(timings) * 1000,
+                "yes" if loaded else "no",
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
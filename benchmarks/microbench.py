@@ -0,0 +1,203 @@
+import argparse
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+# run from a checkout, `sys.path[0]` is this directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mathjson2qubo.model import Model  # noqa: E402
+from mathjson2qubo.parser import Parser  # noqa: E402
+
+N = 100
+
+# allocations of the snapshots themselves
+TRACEMALLOC_FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__)]
+
+
+def _parser():
+    return Parser(
+        vartype="BINARY",
+        variables=[
+            {"symbol": "x", "dimension": 1, "size": N, "type": "BINARY"},
+            {"symbol": "y", "dimension": 2, "size": [N, N], "type": "BINARY"},
+        ],
+        constants=[{"symbol": "N", "values": N}],
+    )
+
+
+def _sum(sym, sup, body):
+    return {
+        "fn": "sum",
+        "sub": {"fn": "equal", "arg": [{"sym": sym}, {"num": 1}]},
+        "sup": sup,
+        "arg": [body],
+    }
+
+
+def bench_sub(parser):
+    arg = {"sym": "y", "sub": {"fn": "list", "arg": [{"num": 3}, {"num": 7}]}}
+    return lambda: parser._sub(arg)
+
+
+def bench_sum(parser):
+    arg = _sum("i", {"sym": "N"}, {"sym": "x", "sub": {"sym": "i"}})
+    return lambda: parser._fn_sum(arg)
+
+
+def bench_nested_sum(parser):
+    body = {"sym": "y", "sub": {"fn": "list", "arg": [{"sym": "i"}, {"sym": "j"}]}}
+    arg = _sum("i", {"num": 20}, _sum("j", {"num": 20}, body))
+    return lambda: parser._fn_sum(arg)
+
+
+def bench_add(parser):
+    terms = [parser.x[i] for i in range(N)]
+    return lambda: parser._fn_add(terms)
+
+
+def bench_multiply(parser):
+    terms = [2.0, parser.x[0], parser.x[1]]
+    return lambda: parser._fn_multiply(terms)
+
+
+def bench_sup(parser):
+    base = parser._fn_add([parser.x[i] for i in range(10)])
+    arg = {"sup": {"num": 2}}
+    return lambda: parser._sup(base, arg)
+
+
+def bench_make_stracture(parser):
+    labels = ["y[{}][{}]".format(i, j) for i in range(N) for j in range(10)]
+    return lambda: Model._make_stracture(labels)
+
+
+BENCHMARKS = {
+    "sub": bench_sub,
+    "sum": bench_sum,
+    "nested_sum": bench_nested_sum,
+    "add": bench_add,
+    "multiply": bench_multiply,
+    "sup": bench_sup,
+    "make_stracture": bench_make_stracture,
+}
+
+
+def measure(func, repeat: int):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # blocks still held after one call, mostly by the result
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot().filter_traces(TRACEMALLOC_FILTERS)
+    result = func()
+    after = tracemalloc.take_snapshot().filter_traces(TRACEMALLOC_FILTERS)
+    tracemalloc.stop()
+    del result
+    held_blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+
+    return {
+        "ops_per_sec": number / best,
+        "held_blocks": held_blocks,
+        "peak_bytes": peak,
+    }
+
+
+# metrics compared with the baseline, and whether a larger value is better
+METRICS = [("ops_per_sec", True), ("held_blocks", False), ("peak_bytes", False)]
+
+
+def compare(results, baseline, threshold: float, memory_threshold: float) -> bool:
+    print(
+        "{:<16} {:<12} {:>14} {:>14} {:>8}".format(
+            "primitive", "metric", "value", "baseline", "ratio"
+        )
+    )
+    passed = True
+    for name, result in results.items():
+        for metric, larger_is_better in METRICS:
+            if metric not in baseline.get(name, {}):
+                continue
+            # blocks and bytes can be 0 in the baseline
+            ratio = result[metric] / max(baseline[name][metric], 1)
+            if larger_is_better:
+                regressed = ratio < 1 - threshold
+            else:
+                regressed = ratio > 1 + memory_threshold
+            passed = passed and not regressed
+            print(
+                "{:<16} {:<12} {:>14.1f} {:>14.1f} {:>8.2f}{}".format(
+                    name,
+                    metric,
+                    result[metric],
+                    baseline[name][metric],
+                    ratio,
+                    " REGRESSED" if regressed else "",
+                )
+            )
+    return passed
+
+
+def main():
+    argparser = argparse.ArgumentParser(
+        description="measure ops/sec and allocations of parser primitives."
+    )
+    argparser.add_argument("--repeat", type=int, default=5)
+    argparser.add_argument("--only", nargs="*", choices=list(BENCHMARKS))
+    argparser.add_argument("--save", help="write the results to a JSON baseline.")
+    argparser.add_argument("--compare", help="compare with a JSON baseline.")
+    argparser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed slowdown ratio against the baseline (default: 0.2).",
+    )
+    argparser.add_argument(
+        "--memory-threshold",
+        type=float,
+        default=0.2,
+        help="allowed growth ratio of held blocks and peak bytes (default: 0.2).",
+    )
+    args = argparser.parse_args()
+
+    parser = _parser()
+    results = {}
+    print(
+        "{:<16} {:>14} {:>12} {:>12}".format(
+            "primitive", "ops/s", "held blocks", "peak[KiB]"
+        )
+    )
+    for name in args.only or BENCHMARKS:
+        result = measure(BENCHMARKS[name](parser), args.repeat)
+        results[name] = result
+        print(
+            "{:<16} {:>14.1f} {:>12} {:>12.1f}".format(
+                name,
+                result["ops_per_sec"],
+                result["held_blocks"],
+                result["peak_bytes"] / 1024,
+            )
+        )
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print()
+        if not compare(results, baseline, args.threshold, args.memory_threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,56 @@
+import importlib
+
 import mathjson2qubo.errors
-import mathjson2qubo.parser
+import mathjson2qubo.estimator
+import mathjson2qubo.schema
+import mathjson2qubo.validator
 from mathjson2qubo.errors import *
-from mathjson2qubo.parser import *
+from mathjson2qubo.estimator import *
+from mathjson2qubo.schema import *
+from mathjson2qubo.validator import *
+
+__all__ = [
+    "CalculationError",
+    "MathJsonFormatError",
+    "MathJsonValidationError",
+    "ModelSizeError",
+    "ParserError",
+    "ParserInitArgumentsError",
+    "SubScriptError",
+    "SumFunctionError",
+    "SuperScriptError",
+    "VariableAccessError",
+    "Constant",
+    "ConstraintTerm",
+    "ObjectiveTerm",
+    "Variable",
+    "Validator",
+    "Estimator",
+    "ModelEstimate",
+    "Model",
+    "Component",
+    "Reduction",
+    "reduce_model",
+    "restore_solution",
+    "Parser",
+]
+
+# names of the modules which import pyqubo / numpy, loaded on first access
+_LAZY_NAMES = {
+    "Model": "model",
+    "Component": "presolve",
+    "Reduction": "presolve",
+    "reduce_model": "presolve",
+    "restore_solution": "presolve",
+    "Parser": "parser",
+}
+_LAZY_MODULES = ("parser", "model", "presolve")
+
+
+def __getattr__(name):
+    if name in _LAZY_MODULES:
+        return importlib.import_module("mathjson2qubo." + name)
+    if name in _LAZY_NAMES:
+        module = importlib.import_module("mathjson2qubo." + _LAZY_NAMES[name])
+        return getattr(module, name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
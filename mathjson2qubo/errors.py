@@ -40,3 +40,24 @@ class SubScriptError(ParserError):
 class SuperScriptError(ParserError):
     def __init__(self, code: int = 7000, message: str = "super script error."):
         super().__init__(code, message)
+
+
+class ModelSizeError(ParserError):
+    def __init__(self, code: int = 8000, message: str = "model size error."):
+        super().__init__(code, message)
+
+
+class MathJsonValidationError(MathJsonFormatError):
+    def __init__(
+        self,
+        errors: list,
+        code: int = 2000,
+        message: str = "MathJson validation error.",
+    ):
+        super().__init__(code, message)
+        self.errors = errors
+
+    def __str__(self) -> str:
+        lines = [super().__str__()]
+        lines += ["  {}: {}".format(path, error) for path, error in self.errors]
+        return "\n".join(lines)
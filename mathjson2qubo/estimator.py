@@ -0,0 +1,350 @@
+import math
+from functools import reduce
+from typing import Dict, List, NamedTuple, Optional, Tuple, TypedDict
+
+from mathjson2qubo.errors import ModelSizeError, ParserInitArgumentsError
+from mathjson2qubo.schema import (
+    ConstraintTerm,
+    ObjectiveTerm,
+    constant_shape,
+    encoding_coefficients,
+    flatten,
+    variable_coefficients,
+    variable_interval,
+    variable_shape,
+)
+from mathjson2qubo.validator import (
+    Validator,
+    inequality_sides,
+    is_inequality,
+    sum_bounds,
+)
+
+Interval = Tuple[float, float]
+
+# bytes of a coefficient of each matrix dtype and of an int64 row / column index
+COEFFICIENT_BYTES = {"float64": 8, "float32": 4, "int64": 8, "int32": 4}
+INDEX_BYTES = 8
+
+
+class Terms(NamedTuple):
+    constant: int
+    linear: int
+    quadratic: int
+
+    def __add__(self, other):
+        return Terms(
+            max(self.constant, other.constant),
+            self.linear + other.linear,
+            self.quadratic + other.quadratic,
+        )
+
+    def __mul__(self, other):
+        return Terms(
+            self.constant * other.constant,
+            self.linear * other.constant + other.linear * self.constant,
+            self.quadratic * other.constant
+            + other.quadratic * self.constant
+            + self.linear * other.linear,
+        )
+
+    def square(self) -> "Terms":
+        # x_i * x_i is reduced to a linear (or constant) term
+        return Terms(
+            self.constant,
+            self.linear,
+            self.quadratic * self.constant + self.linear * (self.linear - 1) // 2,
+        )
+
+    def repeat(self, n: int) -> "Terms":
+        return Terms(self.constant, self.linear * n, self.quadratic * n)
+
+
+CONSTANT = Terms(1, 0, 0)
+VARIABLE = Terms(0, 1, 0)
+
+
+class ModelEstimate(TypedDict):
+    num_variables: int
+    num_linear: int
+    num_quadratic: int
+    num_evaluations: int
+    dense_bytes: int
+    sparse_bytes: int
+
+
+class Estimator:
+    def __init__(self, validator: Validator, dtype: str = "float64"):
+        if dtype not in COEFFICIENT_BYTES:
+            raise ParserInitArgumentsError(
+                code=1008,
+                message="dtype must be one of {}.".format(", ".join(COEFFICIENT_BYTES)),
+            )
+        self.validator = validator
+        self.coefficient_bytes = COEFFICIENT_BYTES[dtype]
+        self.variable_elements = {
+            symbol: reduce(lambda x, y: x * y, variable_shape(variable), 1)
+            for symbol, variable in validator.variables.items()
+        }
+        # binary variables per element
+        self.variable_bits = {
+            symbol: len(variable_coefficients(variable))
+            for symbol, variable in validator.variables.items()
+        }
+        self.variable_sizes = {
+            symbol: size * self.variable_bits[symbol]
+            for symbol, size in self.variable_elements.items()
+        }
+
+    def _interval(self, arg: dict, index: Dict[str, Interval]) -> Optional[Interval]:
+        if "sym" in arg:
+            if arg["sym"] in index:
+                result: Optional[Interval] = index[arg["sym"]]
+            elif arg["sym"] in self.validator.constants:
+                values = flatten(self.validator.constants[arg["sym"]])
+                result = (min(values), max(values)) if len(values) > 0 else None
+            elif arg["sym"] in self.validator.variables:
+                result = variable_interval(self.validator.variables[arg["sym"]])
+            else:
+                return None
+        elif "num" in arg:
+            result = (float(arg["num"]), float(arg["num"]))
+        elif "fn" in arg and arg["fn"] == "sum":
+            n, bound = self._iterations(arg, index)
+            body = self._interval(arg["arg"][0], bound)
+            if body is None:
+                return None
+            result = (min(0.0, n * body[0]), max(0.0, n * body[1]))
+        elif "fn" in arg and arg["fn"] in _INTERVAL_FUNCS:
+            intervals = [self._interval(a, index) for a in arg["arg"]]
+            if any(i is None for i in intervals):
+                return None
+            result = _INTERVAL_FUNCS[arg["fn"]](intervals)
+        else:
+            return None
+
+        if result is not None and "sup" in arg:
+            superscript = self._interval(arg["sup"], index)
+            if superscript is None or superscript[0] != superscript[1]:
+                return None
+            result = _power(result, int(superscript[0]))
+        return result
+
+    def _iterations(
+        self, arg: dict, index: Dict[str, Interval]
+    ) -> Tuple[int, Dict[str, Interval]]:
+        iterations, bound = 1, dict(index)
+        if arg["sub"].get("fn") == "elementof":
+            return self._domain_iterations(arg["sub"], bound)
+
+        for sub, sup in sum_bounds(arg):
+            start = self._interval(sub["arg"][1], index)
+            end = self._interval(sup, index)
+            if start is None or end is None:
+                raise ModelSizeError(
+                    code=8004, message="bounds of sum function can not be estimated."
+                )
+            iterations *= max(0, math.floor(end[1]) - math.ceil(start[0]) + 1)
+            bound[sub["arg"][0]["sym"]] = (start[0], end[1])
+        return iterations, bound
+
+    def _domain_iterations(
+        self, sub: dict, bound: Dict[str, Interval]
+    ) -> Tuple[int, Dict[str, Interval]]:
+        target, domain = sub["arg"]
+        idx_args = target["arg"] if target.get("fn") == "list" else [target]
+        if domain.get("fn") == "support":
+            values = self.validator.constants[domain["arg"][0]["sym"]]
+            iterations = sum(1 for v in flatten(values) if v != 0)
+            columns = [(1.0, float(n)) for n in constant_shape(values)]
+        else:
+            values = self.validator.constants[domain["sym"]]
+            rows = [r if isinstance(r, list) else [r] for r in values]
+            iterations = len(rows)
+            columns = [
+                (min(column), max(column)) if len(column) > 0 else (1.0, 0.0)
+                for column in zip(*rows)
+            ] or [(1.0, 0.0)] * len(idx_args)
+        for a, interval in zip(idx_args, columns):
+            bound[a["sym"]] = (float(interval[0]), float(interval[1]))
+        return iterations, bound
+
+    def _terms(
+        self,
+        arg: dict,
+        index: Dict[str, Interval],
+        used: Dict[str, int],
+        repeat: int = 1,
+    ) -> Tuple[Terms, int]:
+        # `used` is an upper bound of the elements referred for each variable,
+        # `repeat` is the number of times that `arg` is evaluated
+        evaluations = 1
+        if "sym" in arg:
+            symbol = arg["sym"]
+            if symbol in self.validator.variables and symbol not in index:
+                elements = self.variable_elements[symbol]
+                referred = repeat if "sub" in arg else elements
+                used[symbol] = min(elements, used.get(symbol, 0) + referred)
+                terms = VARIABLE.repeat(self.variable_bits[symbol])
+            else:
+                terms = CONSTANT
+            if "sub" in arg:
+                evaluations += self._terms(arg["sub"], index, used, repeat)[1]
+        elif "num" in arg:
+            terms = CONSTANT
+        elif arg["fn"] == "sum":
+            n, bound = self._iterations(arg, index)
+            body, body_evaluations = self._terms(
+                arg["arg"][0], bound, used, repeat * n
+            )
+            return body.repeat(n), evaluations + n * body_evaluations
+        else:
+            children = [self._terms(a, index, used, repeat) for a in arg["arg"]]
+            evaluations += sum(e for _, e in children)
+            if arg["fn"] == "multiply":
+                terms = reduce(lambda x, y: x * y, [t for t, _ in children])
+            elif arg["fn"] == "divide":
+                terms = children[0][0]
+            elif arg["fn"] == "list":
+                terms = CONSTANT
+            else:
+                terms = reduce(lambda x, y: x + y, [t for t, _ in children])
+
+        if "sup" in arg:
+            superscript = self._interval(arg["sup"], index)
+            order = 2 if superscript is None else int(superscript[1])
+            if order == 2:
+                terms = terms.square()
+            elif order <= 0:
+                terms = CONSTANT
+        return terms, evaluations
+
+    def slack_coefficients(self, lhs: dict, rhs: dict) -> List[int]:
+        # `lhs <= rhs` is `lhs - rhs + s = 0` with a slack `s` in [0, max(rhs - lhs)]
+        interval = self._interval({"fn": "subtract", "arg": [rhs, lhs]}, {})
+        if interval is None:
+            raise ModelSizeError(
+                code=8004, message="bounds of inequality can not be estimated."
+            )
+        return encoding_coefficients("log", math.floor(interval[1]))
+
+    def _penalty_terms(self, symbol: str, elements: int) -> Terms:
+        variable = self.validator.variables[symbol]
+        if variable["type"] != "INTEGER" or variable.get("encoding") != "one-hot":
+            return Terms(0, 0, 0)
+        n = self.variable_bits[symbol]
+        return Terms(1, n, n * (n - 1) // 2).repeat(elements)
+
+    def estimate(
+        self,
+        objectives: List[ObjectiveTerm] = [],
+        constraints: List[ConstraintTerm] = [],
+    ) -> ModelEstimate:
+        self.validator.validate(objectives, constraints)
+
+        used: Dict[str, int] = {}
+        total, evaluations, num_slack = Terms(0, 0, 0), 0, 0
+        for term in objectives:
+            terms, term_evaluations = self._terms(term["tex"], {}, used)
+            total, evaluations = total + terms, evaluations + term_evaluations
+        for term in constraints:
+            if not is_inequality(term["tex"]):
+                terms, term_evaluations = self._terms(term["tex"], {}, used)
+                total, evaluations = total + terms, evaluations + term_evaluations
+                continue
+            lhs, rhs = inequality_sides(term["tex"])
+            slack = len(self.slack_coefficients(lhs, rhs))
+            (lhs_terms, lhs_evaluations), (rhs_terms, rhs_evaluations) = (
+                self._terms(lhs, {}, used),
+                self._terms(rhs, {}, used),
+            )
+            terms = lhs_terms + rhs_terms + VARIABLE.repeat(slack)
+            total = total + terms.square()
+            evaluations += lhs_evaluations + rhs_evaluations
+            num_slack += slack
+
+        for symbol, elements in used.items():
+            total = total + self._penalty_terms(symbol, elements)
+        num_variables = num_slack + sum(self.variable_sizes[symbol] for symbol in used)
+        num_linear = min(total.linear, num_variables)
+        num_quadratic = min(total.quadratic, num_variables * (num_variables - 1) // 2)
+        return ModelEstimate(
+            num_variables=num_variables,
+            num_linear=num_linear,
+            num_quadratic=num_quadratic,
+            num_evaluations=evaluations,
+            dense_bytes=num_variables * num_variables * self.coefficient_bytes,
+            sparse_bytes=(num_linear + num_quadratic)
+            * (self.coefficient_bytes + 2 * INDEX_BYTES),
+        )
+
+    @staticmethod
+    def check(
+        estimate: ModelEstimate,
+        max_variables: Optional[int] = None,
+        max_quadratic: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        if max_variables is not None and estimate["num_variables"] > max_variables:
+            raise ModelSizeError(
+                code=8001,
+                message="number of variables exceeds the limit ({} > {}).".format(
+                    estimate["num_variables"], max_variables
+                ),
+            )
+        if max_quadratic is not None and estimate["num_quadratic"] > max_quadratic:
+            raise ModelSizeError(
+                code=8002,
+                message="number of quadratic terms exceeds the limit ({} > {}).".format(
+                    estimate["num_quadratic"], max_quadratic
+                ),
+            )
+        if max_bytes is not None:
+            required = min(estimate["dense_bytes"], estimate["sparse_bytes"])
+            if required > max_bytes:
+                raise ModelSizeError(
+                    code=8003,
+                    message="estimated memory exceeds the limit ({} > {}).".format(
+                        required, max_bytes
+                    ),
+                )
+
+
+def _add(intervals: List[Interval]) -> Interval:
+    return sum(i[0] for i in intervals), sum(i[1] for i in intervals)
+
+
+def _multiply(intervals: List[Interval]) -> Interval:
+    def product(a: Interval, b: Interval) -> Interval:
+        candidates = [a[0] * b[0], a[0] * b[1], a[1] * b[0], a[1] * b[1]]
+        return min(candidates), max(candidates)
+
+    return reduce(product, intervals)
+
+
+def _subtract(intervals: List[Interval]) -> Interval:
+    return intervals[0][0] - intervals[1][1], intervals[0][1] - intervals[1][0]
+
+
+def _divide(intervals: List[Interval]) -> Optional[Interval]:
+    lo, hi = intervals[1]
+    if lo <= 0 <= hi:
+        return None
+    return _multiply([intervals[0], (1 / hi, 1 / lo)])
+
+
+def _negate(intervals: List[Interval]) -> Interval:
+    lo, hi = _add(intervals)
+    return -hi, -lo
+
+
+def _power(interval: Interval, order: int) -> Interval:
+    candidates = [interval[0] ** order, interval[1] ** order]
+    if interval[0] < 0 < interval[1] and order % 2 == 0:
+        candidates.append(0.0)
+    return min(candidates), max(candidates)
+
+
+_INTERVAL_FUNCS = dict(
+    add=_add, multiply=_multiply, subtract=_subtract, divide=_divide, negate=_negate
+)
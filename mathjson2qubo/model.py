@@ -3,14 +3,29 @@ import re
 
 import numpy as np
 
+from mathjson2qubo.errors import CalculationError
+
+DTYPES = ("float64", "float32", "int64", "int32")
+
 
 class Model:
     @classmethod
-    def make_model_from_tuple(cls, obj):
+    def make_model_from_tuple(cls, obj, dtype="float64"):
         label_set, quadratic, const = cls._make_label_quadratic_from_tuple(obj)
-        matrix, label_sorted = cls._make_mat_from_l_quad(label_set, quadratic)
+        matrix, label_sorted = cls._make_mat_from_l_quad(label_set, quadratic, dtype)
         return matrix, const, label_sorted
 
+    @classmethod
+    def make_tuple_from_model(cls, matrix, const, labels, vartype="BINARY"):
+        # inverse of make_model_from_tuple, in the form of to_qubo / to_ising
+        x, y = np.nonzero(np.triu(matrix, 1))
+        quadratic = {(labels[i], labels[j]): float(matrix[i, j]) for i, j in zip(x, y)}
+        linear = {label: float(v) for label, v in zip(labels, matrix.diagonal())}
+        if vartype == "SPIN":
+            return linear, quadratic, const
+        quadratic.update({(label, label): v for label, v in linear.items()})
+        return quadratic, const
+
     @classmethod
     def _make_label_quadratic_from_dict(cls, obj):
         label_set = set()
@@ -43,17 +58,69 @@ class Model:
         return label_set, quadratic, const
 
     @classmethod
-    def _make_mat_from_l_quad(cls, label_set, quadratic):
+    def _make_mat_from_l_quad(cls, label_set, quadratic, dtype="float64"):
         label = cls._make_new_label2index_sorted(label_set)
         spins = len(label)
-        matrix = np.zeros((spins, spins))
-        for k, v in quadratic.items():
-            x = label[str(k[0])]
-            y = label[str(k[1])]
-            matrix[x, y] = v
-            matrix[y, x] = v
+        matrix = np.zeros((spins, spins), dtype=dtype)
+        x = np.array([label[str(k[0])] for k in quadratic], dtype=int)
+        y = np.array([label[str(k[1])] for k in quadratic], dtype=int)
+        values = cls._cast_values(np.fromiter(quadratic.values(), float), dtype)
+        matrix[x, y] = values
+        matrix[y, x] = values
         return matrix, label
 
+    @classmethod
+    def _cast_values(cls, values, dtype):
+        dtype = np.dtype(dtype)
+        if dtype.kind == "i":
+            rounded = np.rint(values)
+            # allow the rounding error of coefficients compiled in float
+            if not np.allclose(values, rounded, rtol=1e-12, atol=1e-9):
+                raise CalculationError(
+                    code=5002,
+                    message="coefficient is not integer for dtype `{}`.".format(
+                        dtype.name
+                    ),
+                )
+            values = rounded
+            # -min is a power of 2, which is exact in float unlike max
+            bound = -float(np.iinfo(dtype).min)
+            overflow = (values >= bound) | (values < -bound)
+        else:
+            overflow = np.abs(values) > np.finfo(dtype).max
+        if np.any(overflow):
+            raise CalculationError(
+                code=5003,
+                message="coefficient overflows dtype `{}`.".format(dtype.name),
+            )
+        return values.astype(dtype)
+
+    @classmethod
+    def qubo_to_ising(cls, matrix, const):
+        # x = (s + 1) / 2
+        diagonal, couplings, total = cls._split_matrix(matrix)
+        ising = cls._with_diagonal(matrix * 0.25, diagonal / 2 + couplings / 4)
+        return ising, const + diagonal.sum() / 2 + total / 8
+
+    @classmethod
+    def ising_to_qubo(cls, matrix, const):
+        # s = 2x - 1
+        diagonal, couplings, total = cls._split_matrix(matrix)
+        qubo = cls._with_diagonal(matrix * 4, 2 * diagonal - 2 * couplings)
+        return qubo, const - diagonal.sum() + total / 2
+
+    @classmethod
+    def _split_matrix(cls, matrix):
+        # each coupling is stored in both triangles
+        diagonal = matrix.diagonal().astype(float)
+        couplings = matrix.sum(axis=1) - diagonal
+        return diagonal, couplings, couplings.sum()
+
+    @classmethod
+    def _with_diagonal(cls, matrix, diagonal):
+        np.fill_diagonal(matrix, diagonal)
+        return matrix
+
     @classmethod
     def _make_new_label2index_sorted(cls, label_sequence):
         label_sorted = cls._sort_label(label_sequence)
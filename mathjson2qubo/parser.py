@@ -1,95 +1,95 @@
-from functools import reduce
-from typing import Callable, Dict, List, TypedDict, Union, cast
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial, reduce
+from itertools import product
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 import numpy as np
 import pyqubo
-from pyqubo import Array, Constraint, Express, Placeholder, Sum, solve_ising, solve_qubo
-from pyqubo.core.express import Binary, Spin
+from pyqubo import Array, Constraint, Express, Placeholder, solve_ising, solve_qubo
+from pyqubo.core.express import AddList, Binary, Spin
 
 from mathjson2qubo.errors import (
     CalculationError,
     MathJsonFormatError,
+    MathJsonValidationError,
     ParserInitArgumentsError,
     SubScriptError,
     SumFunctionError,
     SuperScriptError,
     VariableAccessError,
 )
+from mathjson2qubo.estimator import Estimator, ModelEstimate
+from mathjson2qubo.schema import (
+    Constant,
+    ConstraintTerm,
+    ObjectiveTerm,
+    Variable,
+    variable_coefficients,
+    variable_shape,
+)
+from mathjson2qubo.validator import (
+    Validator,
+    inequality_sides,
+    is_inequality,
+    sum_bounds,
+)
 
-from .model import Model
+from .model import DTYPES, Model
+from .presolve import Component, Reduction, reduce_model, restore_solution
 
 ComputableTerm = Union[float, Express]
 Term = Union[float, List[int], Express]
 
 
-class Variable(TypedDict):
-    symbol: str
-    dimension: int
-    type: str
-    size: Union[int, list]
-
-
-class Constant(TypedDict):
-    symbol: str
-    values: Union[int, float, list]
-
-
-class ObjectiveTerm(TypedDict):
-    label: str
-    tex: dict
-    weight: float
-
-
-class ConstraintTerm(TypedDict):
-    label: str
-    tex: dict
-    weight: float
-
-
 class Parser:
     def __init__(
-        self, vartype: str, variables: List[Variable], constants: List[Constant] = []
+        self,
+        vartype: str,
+        variables: List[Variable],
+        constants: List[Constant] = [],
+        dtype: str = "float64",
     ):
-        if len(variables) == 0:
-            raise ParserInitArgumentsError(code=1001, message="variable is required.")
-
+        self._validator = Validator(variables, constants)
         self.vartype = vartype
+        if dtype not in DTYPES:
+            raise ParserInitArgumentsError(
+                code=1008, message="dtype must be one of {}.".format(", ".join(DTYPES))
+            )
+        self.dtype = dtype
+        self._integers: Dict[str, Tuple[Variable, List[int]]] = {}
+        # one-hot penalty of each element, added only for the referred elements
+        self._penalties: Dict[str, Dict[Tuple[int, ...], Express]] = {}
+        self._referred: Dict[str, Set[Tuple[int, ...]]] = {}
 
         # set variables
         for variable in variables:
-            if len(variable["symbol"]) != 1:
-                raise ParserInitArgumentsError(
-                    code=1002, message="variable symbol must be one character."
-                )
-
-            if variable["dimension"] == 0:
+            if variable["type"] == "INTEGER":
+                var = self._create_integer(variable)
+            elif variable["dimension"] == 0:
                 if variable["type"] == "SPIN":
                     var = Spin(variable["symbol"])
                 else:
                     var = Binary(variable["symbol"])
             elif variable["dimension"] == 1:
-                if isinstance(variable["size"], int):
-                    var = Array.create(
-                        variable["symbol"], variable["size"], variable["type"]
-                    )
-                else:
-                    raise ParserInitArgumentsError(
-                        code=1004,
-                        message="if variable dimension is 1, variable size must be int.",
-                    )
-            elif variable["dimension"] >= 2:
-                if isinstance(variable["size"], list):
-                    var = Array.create(
-                        variable["symbol"], tuple(variable["size"]), variable["type"]
-                    )
-                else:
-                    raise ParserInitArgumentsError(
-                        code=1005,
-                        message="if variable dimension is larger than 1, variable size must be list.",
-                    )
+                var = Array.create(
+                    variable["symbol"], variable["size"], variable["type"]
+                )
             else:
-                raise ParserInitArgumentsError(
-                    code=1003, message="variable dimension must be positive integer."
+                var = Array.create(
+                    variable["symbol"], tuple(variable["size"]), variable["type"]
                 )
             exec("self.{} = var".format(variable["symbol"]))
 
@@ -101,6 +101,48 @@ class Parser:
                 const = np.array(constant["values"])
             exec("self.{} = const".format(constant["symbol"]))
 
+    def _create_integer(self, variable: Variable) -> Union[Express, np.ndarray]:
+        # an integer is `lower + sum_k c_k b_k` over its own binary variables, whose
+        # coefficients are shared by all elements of the variable
+        symbol = variable["symbol"]
+        shape = variable_shape(variable)
+        coefficients = variable_coefficients(variable)
+        bits = Array.create(symbol, shape + (len(coefficients),), "BINARY")
+        self._integers[symbol] = (variable, coefficients)
+
+        lower = variable.get("lower", 0)
+        encoded = np.empty(shape, dtype=object)
+        one_hot = {}
+        for idx in np.ndindex(*shape):
+            element = bits[idx] if len(idx) > 0 else bits
+            encoded[idx] = lower + AddList(
+                [c * element[k] for k, c in enumerate(coefficients) if c != 0]
+            )
+            if variable.get("encoding") == "one-hot":
+                one_hot[idx] = (AddList(list(element)) - 1) ** 2
+
+        if len(one_hot) > 0:
+            self._penalties[symbol] = one_hot
+        return encoded[()] if len(shape) == 0 else encoded
+
+    def _decode_integers(self, decoded: dict) -> dict:
+        for symbol, (variable, coefficients) in self._integers.items():
+            if symbol not in decoded:
+                continue
+            shape = variable_shape(variable) + (len(coefficients),)
+            bits = np.full(shape, np.nan)
+            for idx in np.ndindex(*shape):
+                bits[idx] = _lookup(decoded[symbol], idx)
+            # elements whose bits are missing from the model are not referred by any
+            # term, so they have no value
+            found = ~np.all(np.isnan(bits), axis=-1)
+            if self.vartype == "SPIN":
+                bits = (bits + 1) / 2
+            bits = np.nan_to_num(bits)
+            values = variable.get("lower", 0) + bits @ np.array(coefficients)
+            decoded[symbol] = _nest(values.astype(int), found)
+        return decoded
+
     @property
     def funcs(self) -> Dict[str, Callable]:
         return dict(
@@ -133,15 +175,121 @@ class Parser:
     def _fn_list(self, args: List[ComputableTerm]) -> List[int]:
         return list(map(int, args))
 
-    def _fn_sum(self, arg: dict, index: Dict[str, int] = None) -> Express:
-        if "sub" not in arg or "sup" not in arg:
+    def _fn_sum(self, arg: dict, index: Dict[str, int] = None) -> ComputableTerm:
+        if "sub" not in arg or ("sup" not in arg and not _is_domain(arg["sub"])):
             raise SumFunctionError(
                 code=4001, message="sum function requires `sub` and `sup`."
             )
 
+        bound = {} if index is None else index
+        if _is_domain(arg["sub"]):
+            return self._fn_sum_over_domain(arg, bound)
+
+        ranges = self._sum_ranges(arg, bound)
+        idx_syms = {idx_sym for idx_sym, _ in ranges}
+
+        # variable-free body is reduced with numpy instead of per-index evaluation
+        if self._is_constant(arg["arg"][0], set(bound) | idx_syms):
+            return float(self._sum_array(arg, dict(bound), 0))
+
+        # nested sums whose bounds do not refer to the outer indices are fused
+        body = arg["arg"][0]
+        while "fn" in body and body["fn"] == "sum" and "sub" in body and "sup" in body:
+            if (
+                _is_domain(body["sub"])
+                or len((_symbols(body["sub"]) | _symbols(body["sup"])) & idx_syms) > 0
+            ):
+                break
+            ranges += self._sum_ranges(body, bound)
+            idx_syms |= {idx_sym for idx_sym, _ in ranges}
+            body = body["arg"][0]
+
+        return self._iterate_sum(
+            [idx_sym for idx_sym, _ in ranges],
+            product(*[indices for _, indices in ranges]),
+            body,
+            bound,
+        )
+
+    def _fn_sum_over_domain(self, arg: dict, index: Dict[str, int]) -> ComputableTerm:
+        idx_syms, domain = self._sum_domain(arg["sub"], index)
+        if self._is_constant(arg["arg"][0], set(index) | set(idx_syms)):
+            return float(self._sum_array(arg, dict(index), 0))
+        return self._iterate_sum(
+            idx_syms, map(tuple, domain.tolist()), arg["arg"][0], index
+        )
+
+    def _sum_domain(self, sub: dict, index: dict) -> Tuple[List[str], np.ndarray]:
+        if len(sub.get("arg", [])) != 2:
+            raise SumFunctionError(
+                code=4004,
+                message="subscript of sum function must be the equation of 2 elements.",
+            )
+
+        target, domain_arg = sub["arg"]
+        idx_args = target["arg"] if target.get("fn") == "list" else [target]
+        if any("sym" not in a for a in idx_args):
+            raise SumFunctionError(
+                code=4003,
+                message="sum function requires an index variable (not constant).",
+            )
+
+        if domain_arg.get("fn") == "support" and _is_symbol_list(domain_arg, 1):
+            values = getattr(self, domain_arg["arg"][0]["sym"], None)
+            if not isinstance(values, np.ndarray):
+                raise SumFunctionError(
+                    code=4008,
+                    message="domain of sum function must be a constant index set.",
+                )
+            # positions of nonzero entries, 1-origin
+            domain = np.argwhere(values != 0) + 1
+        elif "sym" in domain_arg and "sub" not in domain_arg:
+            values = getattr(self, domain_arg["sym"], None)
+            if (
+                not isinstance(values, np.ndarray)
+                or values.ndim > 2
+                or values.dtype.kind not in "biuf"
+                or np.any(np.mod(values, 1) != 0)
+            ):
+                raise SumFunctionError(
+                    code=4008,
+                    message="domain of sum function must be a constant index set.",
+                )
+            # entries are 1-origin subscripts, 0 or below would wrap around
+            if np.any(values < 1):
+                raise VariableAccessError(
+                    code=3002, message="variable index is out of range."
+                )
+            domain = values[:, None] if values.ndim == 1 else values
+        else:
+            raise SumFunctionError(
+                code=4008,
+                message="domain of sum function must be a constant index set.",
+            )
+
+        if domain.shape[1] != len(idx_args):
+            raise SumFunctionError(
+                code=4009,
+                message="number of indices does not match the domain of sum function.",
+            )
+        return [a["sym"] for a in idx_args], domain.astype(int)
+
+    def _sum_ranges(self, arg: dict, index: Dict[str, int]) -> List[Tuple[str, range]]:
         sub = arg["sub"]
         sup = arg["sup"]
+        if sub.get("fn") != "list":
+            return [self._sum_range(sub, sup, index)]
 
+        if sup.get("fn") != "list" or len(sub["arg"]) != len(sup["arg"]):
+            raise SumFunctionError(
+                code=4007,
+                message="sub and sup of multi-index sum function must have the same length.",
+            )
+        return [self._sum_range(s, u, index) for s, u in zip(sub["arg"], sup["arg"])]
+
+    def _sum_range(
+        self, sub: dict, sup: dict, index: Dict[str, int]
+    ) -> Tuple[str, range]:
         if sub["fn"] != "equal":
             raise SumFunctionError(
                 code=4002, message="sub script of sum function must be equal function."
@@ -160,8 +308,8 @@ class Parser:
             )
 
         idx_sym: str = sub["arg"][0]["sym"]
-        start_index = self.parse_mathjson(sub["arg"][1])
-        end_index = self.parse_mathjson(sup)
+        start_index = self.parse_mathjson(sub["arg"][1], index)
+        end_index = self.parse_mathjson(sup, index)
 
         if not isinstance(start_index, float) or not float.is_integer(start_index):
             raise SumFunctionError(
@@ -173,18 +321,179 @@ class Parser:
                 code=4006, message="end index of sum function must be integer.",
             )
 
-        start_index = int(start_index) - 1
-        end_index = int(end_index)
+        return idx_sym, range(int(start_index), int(end_index) + 1)
 
-        return Sum(
-            start_index,
-            end_index,
-            lambda i: self.parse_mathjson(
-                arg["arg"][0],
-                dict({idx_sym: i + 1}, **({} if index is None else index)),
-            ),
+    def _iterate_sum(
+        self,
+        idx_syms: List[str],
+        indices: Iterable[Tuple[int, ...]],
+        body: dict,
+        index: Dict[str, int],
+    ) -> ComputableTerm:
+        # a single binding dict is updated in place over the index space
+        binding = dict(index)
+        terms = []
+        for values in indices:
+            binding.update(zip(idx_syms, values))
+            terms.append(self.parse_mathjson(body, binding))
+
+        if all(not isinstance(t, Express) for t in terms):
+            return float(sum(terms))
+        # AddList avoids the list copy of repeated `+`; the terms are grouped in
+        # chunks of sqrt(n) since pyqubo merges the variables of AddList one by one.
+        chunk = max(1, math.isqrt(len(terms)))
+        return AddList(
+            [AddList(terms[i : i + chunk]) for i in range(0, len(terms), chunk)]
         )
 
+    def _is_constant(self, arg: dict, index: Set[str]) -> bool:
+        if "sym" in arg:
+            if arg["sym"] in index:
+                result = "sub" not in arg
+            elif arg["sym"] in self._validator.variables:
+                return False
+            elif "sub" in arg:
+                values = getattr(self, arg["sym"], None)
+                sub = arg["sub"]
+                num_sub = len(sub["arg"]) if sub.get("fn") == "list" else 1
+                result = (
+                    isinstance(values, np.ndarray)
+                    and values.dtype.kind in "biuf"
+                    and values.ndim == num_sub
+                    and self._is_constant(sub, index)
+                )
+            else:
+                result = isinstance(getattr(self, arg["sym"], None), float)
+        elif "num" in arg:
+            result = True
+        elif "fn" in arg and arg["fn"] == "sum" and _is_domain(arg.get("sub")):
+            target = arg["sub"]["arg"][0]
+            idx_args = target["arg"] if target.get("fn") == "list" else [target]
+            if any("sym" not in a for a in idx_args):
+                return False
+            return self._is_constant(
+                arg["arg"][0], index | {a["sym"] for a in idx_args}
+            )
+        elif "fn" in arg and arg["fn"] == "sum":
+            try:
+                bounds = sum_bounds(arg)
+            except (KeyError, AttributeError, TypeError):
+                return False
+            if any(not _is_range(sub) for sub, _ in bounds):
+                return False
+            idx_syms = {sub["arg"][0]["sym"] for sub, _ in bounds}
+            return all(
+                self._is_constant(sub["arg"][1], index)
+                and self._is_constant(sup, index)
+                for sub, sup in bounds
+            ) and self._is_constant(arg["arg"][0], index | idx_syms)
+        elif "fn" in arg and arg["fn"] in self.funcs:
+            result = all(self._is_constant(a, index) for a in arg["arg"])
+        else:
+            return False
+
+        if "sup" in arg:
+            result = result and self._is_constant(arg["sup"], index)
+        return result
+
+    def _sub_array(self, arg: dict, index: dict, depth: int, mask) -> np.ndarray:
+        values = getattr(self, arg["sym"])
+        subscript = self._evaluate_array(arg["sub"], index, depth, mask)
+        subscript = subscript if isinstance(subscript, list) else [subscript]
+        if len(subscript) > values.ndim:
+            raise VariableAccessError(
+                code=3002, message="variable index is out of range."
+            )
+        positions = []
+        for s, n in zip(subscript, values.shape):
+            s = np.asarray(s)
+            if np.any((np.mod(s, 1) != 0) & mask):
+                raise SubScriptError(code=6001, message="subscript must be integer.")
+            position = s.astype(int) - 1
+            if np.any(((position < 0) | (position >= n)) & mask):
+                raise VariableAccessError(
+                    code=3002, message="variable index is out of range."
+                )
+            # indices out of the summation are not used, any valid position will do
+            positions.append(np.where(mask, position, 0))
+        return values[tuple(positions)].astype(float)
+
+    def _sum_array(self, arg: dict, index: dict, depth: int, mask=True) -> np.ndarray:
+        # each index gets its own leading axis, so that the body broadcasts over
+        # the whole index space and the sum is a reduction of the axes. `mask` marks
+        # the entries in the index space, the others are evaluated but not checked.
+        binding = dict(index)
+        if _is_domain(arg["sub"]):
+            idx_syms, domain = self._sum_domain(arg["sub"], index)
+            for column, idx_sym in enumerate(idx_syms):
+                binding[idx_sym] = (
+                    domain[:, column].astype(float).reshape((-1,) + (1,) * depth)
+                )
+            mask = np.ones((len(domain),) + (1,) * depth, dtype=bool) & mask
+            body = self._evaluate_array(arg["arg"][0], binding, depth + 1, mask)
+            return np.where(mask, body, 0.0).sum(axis=0)
+
+        bounds = sum_bounds(arg)
+        for axis, (sub, sup) in enumerate(bounds):
+            start = np.asarray(
+                self._evaluate_array(sub["arg"][1], index, depth, mask)
+            )
+            end = np.asarray(self._evaluate_array(sup, index, depth, mask))
+            if np.any((np.mod(start, 1) != 0) & mask):
+                raise SumFunctionError(
+                    code=4005, message="start index of sum function must be integer.",
+                )
+            if np.any((np.mod(end, 1) != 0) & mask):
+                raise SumFunctionError(
+                    code=4006, message="end index of sum function must be integer.",
+                )
+
+            starts, ends = _masked(start, mask), _masked(end, mask)
+            if len(starts) == 0:
+                k = np.arange(0)
+            else:
+                k = np.arange(starts.min(), ends.max() + 1)
+            k = k.reshape((-1,) + (1,) * (depth + axis))
+            binding[sub["arg"][0]["sym"]] = k
+            mask = mask & (k >= start) & (k <= end)
+
+        body = self._evaluate_array(arg["arg"][0], binding, depth + len(bounds), mask)
+        return np.where(mask, body, 0.0).sum(axis=tuple(range(len(bounds))))
+
+    def _evaluate_array(self, arg: dict, index: dict, depth: int, mask=True):
+        if "sym" in arg:
+            if arg["sym"] in index:
+                result = index[arg["sym"]]
+            elif "sub" in arg:
+                result = self._sub_array(arg, index, depth, mask)
+            else:
+                result = getattr(self, arg["sym"])
+        elif "num" in arg:
+            result = float(arg["num"])
+        elif arg["fn"] == "sum":
+            return self._sum_array(arg, index, depth, mask)
+        else:
+            args = [self._evaluate_array(a, index, depth, mask) for a in arg["arg"]]
+            if arg["fn"] == "list":
+                result = args
+            elif arg["fn"] == "divide":
+                if np.any((np.asarray(args[1]) == 0) & mask):
+                    raise CalculationError(code=5001, message="zero division error.")
+                args[1] = np.where(mask, args[1], 1.0)
+                result = self.funcs[arg["fn"]](args)
+            else:
+                result = self.funcs[arg["fn"]](args)
+
+        if "sup" in arg:
+            if isinstance(result, list):
+                raise SuperScriptError(code=7001, message="cardinal must not be list.")
+            superscript = self._evaluate_array(arg["sup"], index, depth, mask)
+            if isinstance(superscript, list):
+                raise SuperScriptError(code=7002, message="index must be number.")
+            with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+                result = np.asarray(result, dtype=float) ** np.trunc(superscript)
+        return result
+
     def _sup(
         self, base: Term, arg: dict, index: Dict[str, int] = None
     ) -> ComputableTerm:
@@ -209,14 +518,36 @@ class Parser:
             subscript = int(subscript) - 1
         else:
             raise SubScriptError(code=6001, message="subscript must be integer.")
+        # negative positions would be taken from the end of the array
+        positions = subscript if isinstance(subscript, tuple) else (subscript,)
+        if any(p < 0 for p in positions):
+            raise VariableAccessError(
+                code=3002, message="variable index is out of range."
+            )
         try:
-            return eval("self.{}[{}]".format(arg["sym"], subscript))
+            result = eval("self.{}[{}]".format(arg["sym"], subscript))
         except AttributeError:
             raise VariableAccessError(code=3001, message="not found the variable.")
         except (TypeError, IndexError):
             raise VariableAccessError(
                 code=3002, message="variable index is out of range."
             )
+        self._refer(arg["sym"], positions)
+        return result
+
+    def _refer(self, symbol: str, positions: Tuple[int, ...]) -> None:
+        if symbol not in self._penalties:
+            return
+        referred = self._referred.setdefault(symbol, set())
+        if positions in self._penalties[symbol]:
+            referred.add(positions)
+        else:
+            # a part of the array is referred by the leading positions
+            referred.update(
+                idx
+                for idx in self._penalties[symbol]
+                if idx[: len(positions)] == positions
+            )
 
     def parse_mathjson(self, arg: dict, index: Dict[str, int] = None) -> Term:
         result = None
@@ -233,11 +564,16 @@ class Parser:
                         raise VariableAccessError(
                             code=3001, message="not found the variable."
                         )
+                    self._refer(arg["sym"], ())
         elif "num" in arg:
             result = float(arg["num"])
         elif "fn" in arg:
             if arg["fn"] == "sum":
                 return self._fn_sum(arg, index)
+            elif arg["fn"] not in self.funcs:
+                raise MathJsonFormatError(
+                    code=2002, message="unknown function `{}`.".format(arg["fn"])
+                )
             else:
                 parsed_args = list(
                     map(lambda a: self.parse_mathjson(a, index), arg["arg"])
@@ -245,7 +581,7 @@ class Parser:
                 result = self.funcs[arg["fn"]](parsed_args)
 
         if "sup" in arg:
-            result = self._sup(result, arg)
+            result = self._sup(result, arg, index)
 
         if result is None:
             raise MathJsonFormatError(
@@ -255,20 +591,69 @@ class Parser:
 
         return result
 
+    def validate(
+        self,
+        objectives: List[ObjectiveTerm] = [],
+        constraints: List[ConstraintTerm] = [],
+    ) -> None:
+        try:
+            self._validator.validate(objectives, constraints)
+        except MathJsonValidationError as e:
+            # a single error is raised as is, like the errors raised while parsing
+            if len(e.errors) == 1:
+                raise e.errors[0][1] from None
+            raise
+
+    def estimate(
+        self,
+        objectives: List[ObjectiveTerm] = [],
+        constraints: List[ConstraintTerm] = [],
+    ) -> ModelEstimate:
+        return Estimator(self._validator, self.dtype).estimate(
+            objectives, constraints
+        )
+
+    def _parse_constraint(self, constraint: ConstraintTerm) -> ComputableTerm:
+        if not is_inequality(constraint["tex"]):
+            return self.parse_mathjson(constraint["tex"])
+
+        lhs, rhs = inequality_sides(constraint["tex"])
+        coefficients = Estimator(self._validator).slack_coefficients(lhs, rhs)
+        difference = self.parse_mathjson(lhs) - self.parse_mathjson(rhs)
+        if len(coefficients) == 0:
+            return difference ** 2
+        slack = Array.create(
+            "{}_slack".format(constraint["label"]), len(coefficients), "BINARY"
+        )
+        return (difference + AddList([c * s for c, s in zip(coefficients, slack)])) ** 2
+
     def parse_to_pyqubo_model(
         self,
         objectives: List[ObjectiveTerm] = [],
         constraints: List[ConstraintTerm] = [],
     ) -> pyqubo.Model:
+        self.validate(objectives, constraints)
+        self._referred = {}
         parsed_objectives = [
             Placeholder(o["label"]) * self.parse_mathjson(o["tex"]) for o in objectives
         ]
         parsed_constraints = [
             Placeholder(c["label"])
-            * Constraint(self.parse_mathjson(c["tex"]), label=c["label"])
+            * Constraint(self._parse_constraint(c), label=c["label"])
             for c in constraints
         ]
-        H = cast(Express, sum(parsed_objectives) + sum(parsed_constraints))
+        penalties = [
+            self._integers[symbol][0].get("penalty", 1.0)
+            * Constraint(
+                AddList([self._penalties[symbol][idx] for idx in sorted(referred)]),
+                label="{}_one_hot".format(symbol),
+            )
+            for symbol, referred in self._referred.items()
+        ]
+        H = cast(
+            Express,
+            sum(parsed_objectives) + sum(parsed_constraints) + sum(penalties),
+        )
         pyqubo_model = H.compile()
         return pyqubo_model
 
@@ -279,26 +664,151 @@ class Parser:
         num_reads=10,
         sweeps=1000,
         beta_range=(1, 50),
+        workers: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        target_energy: Optional[float] = None,
+        patience: Optional[int] = None,
+        callback: Optional[Callable] = None,
     ):
-        pyqubo_model = self.parse_to_pyqubo_model(objectives, constraints)
-        feed_dict = {}
-        feed_dict.update({o["label"]: o["weight"] for o in objectives})
-        feed_dict.update({c["label"]: c["weight"] for c in constraints})
+        if workers is not None and (not isinstance(workers, int) or workers < 1):
+            raise ParserInitArgumentsError(
+                code=1009, message="workers must be positive integer."
+            )
+        if time_limit is None:
+            if any(o is not None for o in (target_energy, patience, callback)):
+                raise ParserInitArgumentsError(
+                    code=1011,
+                    message="target_energy, patience and callback require time_limit.",
+                )
+        else:
+            if workers is not None:
+                raise ParserInitArgumentsError(
+                    code=1010, message="workers can not be used with time_limit."
+                )
+            result = None
+            for result in self.solve_iter(
+                objectives,
+                constraints,
+                time_limit,
+                target_energy=target_energy,
+                patience=patience,
+                num_reads=num_reads,
+                sweeps=sweeps,
+                beta_range=beta_range,
+            ):
+                if callback is not None:
+                    callback(*result)
+            return result
 
-        if self.vartype == "SPIN":
-            linear, quad, offset = pyqubo_model.to_ising(feed_dict=feed_dict)
-            solution = solve_ising(
-                linear, quad, num_reads=num_reads, sweeps=sweeps, beta_range=beta_range
+        pyqubo_model = self.parse_to_pyqubo_model(objectives, constraints)
+        feed_dict = _feed_dict(objectives, constraints)
+
+        if workers is not None:
+            solution = self._solve_components(
+                pyqubo_model,
+                feed_dict,
+                workers,
+                num_reads=num_reads,
+                sweeps=sweeps,
+                beta_range=beta_range,
             )
         else:
-            model, offset = pyqubo_model.to_qubo(feed_dict=feed_dict)
-            solution = solve_qubo(
-                model, num_reads=num_reads, sweeps=sweeps, beta_range=beta_range
+            model = self._to_model(pyqubo_model, feed_dict)
+            solution = _sample(
+                model,
+                self.vartype,
+                num_reads=num_reads,
+                sweeps=sweeps,
+                beta_range=beta_range,
+            )
+        return self._decode(pyqubo_model, solution, feed_dict, constraints)
+
+    def solve_iter(
+        self,
+        objectives: List[ObjectiveTerm] = [],
+        constraints: List[ConstraintTerm] = [],
+        time_limit: float = 1.0,
+        target_energy: Optional[float] = None,
+        patience: Optional[int] = None,
+        num_reads=10,
+        sweeps=1000,
+        beta_range=(1, 50),
+    ) -> Iterator[Tuple[dict, dict, float]]:
+        # anneals batches of `num_reads` and yields the solution whenever the energy
+        # improves, until the time limit (including the compilation), the target
+        # energy or `patience` batches without improvement
+        start = time.perf_counter()
+        pyqubo_model = self.parse_to_pyqubo_model(objectives, constraints)
+        feed_dict = _feed_dict(objectives, constraints)
+        model = self._to_model(pyqubo_model, feed_dict)
+
+        best, stagnation, batch_time = math.inf, 0, 0.0
+        while True:
+            batch_start = time.perf_counter()
+            solution = _sample(
+                model,
+                self.vartype,
+                num_reads=num_reads,
+                sweeps=sweeps,
+                beta_range=beta_range,
             )
+            batch_time = max(batch_time, time.perf_counter() - batch_start)
+
+            energy = _energy(model, solution)
+            if energy < best:
+                best, stagnation = energy, 0
+                yield self._decode(pyqubo_model, solution, feed_dict, constraints)
+            else:
+                stagnation += 1
+
+            # the next batch is not started if it would exceed the time limit
+            if (
+                (target_energy is not None and best <= target_energy)
+                or (patience is not None and stagnation >= patience)
+                or time.perf_counter() - start + batch_time > time_limit
+            ):
+                return
 
-        return pyqubo_model.decode_solution(
+    def _to_model(self, pyqubo_model: pyqubo.Model, feed_dict: dict) -> tuple:
+        if self.vartype == "SPIN":
+            return pyqubo_model.to_ising(feed_dict=feed_dict)
+        return pyqubo_model.to_qubo(feed_dict=feed_dict)
+
+    def _decode(
+        self,
+        pyqubo_model: pyqubo.Model,
+        solution: dict,
+        feed_dict: dict,
+        constraints: List[ConstraintTerm],
+    ) -> Tuple[dict, dict, float]:
+        decoded, broken, energy = pyqubo_model.decode_solution(
             solution, vartype=self.vartype, feed_dict=feed_dict
         )
+        for c in constraints:
+            decoded.pop("{}_slack".format(c["label"]), None)
+        return self._decode_integers(decoded), broken, energy
+
+    def _solve_components(
+        self, pyqubo_model: pyqubo.Model, feed_dict: dict, workers: int, **params
+    ) -> dict:
+        # the presolved components are annealed separately, in `workers` processes
+        model = self._to_model(pyqubo_model, feed_dict)
+        matrix, const, label = Model.make_model_from_tuple(model)
+        reduction = reduce_model(matrix, const, label, self.vartype)
+
+        batches = _balance(reduction.components, workers)
+        anneal = partial(_anneal, vartype=self.vartype, **params)
+        if len(batches) <= 1:
+            solutions = list(map(anneal, batches))
+        else:
+            with ProcessPoolExecutor(max_workers=len(batches)) as executor:
+                solutions = list(executor.map(anneal, batches))
+
+        solution = restore_solution(reduction, solutions)
+        default = -1 if self.vartype == "SPIN" else 0
+        return {
+            label: solution.get(label, default) for label in pyqubo_model.variable_order
+        }
 
     def parse_to_matrix(
         self,
@@ -306,13 +816,114 @@ class Parser:
         constraints: List[ConstraintTerm] = [],
     ):
         pyqubo_model = self.parse_to_pyqubo_model(objectives, constraints)
-        feed_dict = {}
-        feed_dict.update({o["label"]: o["weight"] for o in objectives})
-        feed_dict.update({c["label"]: c["weight"] for c in constraints})
+        model = self._to_model(pyqubo_model, _feed_dict(objectives, constraints))
+        return Model.make_model_from_tuple(model, self.dtype)
 
-        if self.vartype == "SPIN":
-            model = pyqubo_model.to_ising(feed_dict=feed_dict)
-        else:
-            model = pyqubo_model.to_qubo(feed_dict=feed_dict)
+    def presolve(
+        self,
+        objectives: List[ObjectiveTerm] = [],
+        constraints: List[ConstraintTerm] = [],
+    ) -> Reduction:
+        matrix, const, label = self.parse_to_matrix(objectives, constraints)
+        return reduce_model(matrix, const, label, self.vartype)
+
+
+def _feed_dict(
+    objectives: List[ObjectiveTerm], constraints: List[ConstraintTerm]
+) -> Dict[str, float]:
+    feed_dict = {}
+    feed_dict.update({o["label"]: o["weight"] for o in objectives})
+    feed_dict.update({c["label"]: c["weight"] for c in constraints})
+    return feed_dict
+
+
+def _sample(model: tuple, vartype: str, **params) -> Dict[str, int]:
+    if vartype == "SPIN":
+        return solve_ising(model[0], model[1], **params)
+    return solve_qubo(model[0], **params)
 
-        return Model.make_model_from_tuple(model)
+
+def _energy(model: tuple, solution: dict) -> float:
+    # `model` is the output of to_qubo / to_ising, whose last element is the offset
+    *terms, offset = model
+    return offset + sum(
+        v * solution[k[0]] * solution[k[1]] if isinstance(k, tuple) else v * solution[k]
+        for term in terms
+        for k, v in term.items()
+    )
+
+
+def _anneal(components: List[Component], vartype: str, **params) -> Dict[str, int]:
+    solution: Dict[str, int] = {}
+    for component in components:
+        model = Model.make_tuple_from_model(
+            component.matrix, 0.0, component.labels, vartype
+        )
+        solution.update(_sample(model, vartype, **params))
+    return solution
+
+
+def _balance(components: List[Component], workers: int) -> List[List[Component]]:
+    # largest first onto the least loaded batch, the load is the number of terms
+    batches: List[List[Component]] = [[] for _ in range(min(workers, len(components)))]
+    loads = [0] * len(batches)
+    for component in sorted(components, key=lambda c: -np.count_nonzero(c.matrix)):
+        i = loads.index(min(loads))
+        batches[i].append(component)
+        loads[i] += np.count_nonzero(component.matrix)
+    return batches
+
+
+def _symbols(arg) -> Set[str]:
+    if isinstance(arg, list):
+        return set().union(*[_symbols(a) for a in arg])
+    if not isinstance(arg, dict):
+        return set()
+    symbols = {arg["sym"]} if "sym" in arg else set()
+    for key in ("sub", "sup", "arg"):
+        if key in arg:
+            symbols |= _symbols(arg[key])
+    return symbols
+
+
+def _masked(values: np.ndarray, mask) -> np.ndarray:
+    shape = np.broadcast(values, mask).shape
+    return np.broadcast_to(values, shape)[np.broadcast_to(mask, shape)]
+
+
+def _lookup(tree: dict, idx: Tuple[int, ...]) -> float:
+    for i in idx:
+        if not isinstance(tree, dict) or i not in tree:
+            return np.nan
+        tree = tree[i]
+    return float(tree)
+
+
+def _nest(values: np.ndarray, found: np.ndarray):
+    if values.ndim == 0:
+        return int(values)
+    return {
+        i: _nest(v, f) for i, (v, f) in enumerate(zip(values, found)) if np.any(f)
+    }
+
+
+def _is_symbol_list(arg: dict, length: int) -> bool:
+    args = arg.get("arg")
+    return (
+        isinstance(args, list)
+        and len(args) == length
+        and all(isinstance(a, dict) and "sym" in a for a in args)
+    )
+
+
+def _is_domain(sub) -> bool:
+    return isinstance(sub, dict) and sub.get("fn") == "elementof"
+
+
+def _is_range(sub: dict) -> bool:
+    return (
+        isinstance(sub, dict)
+        and sub.get("fn") == "equal"
+        and len(sub.get("arg", [])) == 2
+        and "sym" in sub["arg"][0]
+    )
@@ -0,0 +1,103 @@
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+
+from .model import Model
+
+
+class Component(NamedTuple):
+    matrix: np.ndarray
+    labels: List[str]
+
+
+class Reduction(NamedTuple):
+    vartype: str
+    offset: float
+    fixed: Dict[str, int]
+    components: List[Component]
+
+
+def reduce_model(
+    matrix: np.ndarray, const, labels: Dict[str, int], vartype: str = "BINARY"
+) -> Reduction:
+    # variables are fixed and split on the QUBO form, the components are returned
+    # in the form of `vartype`
+    if vartype == "SPIN":
+        matrix, const = Model.ising_to_qubo(matrix, const)
+    matrix = matrix.astype(float)
+    order = sorted(labels, key=lambda label: labels[label])
+
+    values, offset = _fix_variables(matrix)
+    offset += const
+    free = np.flatnonzero(values < 0)
+
+    components = []
+    for indices in _connected_components(matrix[np.ix_(free, free)]):
+        positions = free[indices]
+        sub = matrix[np.ix_(positions, positions)]
+        # linear terms coming from the couplings with variables fixed to 1
+        np.fill_diagonal(sub, sub.diagonal() + matrix[positions][:, values == 1].sum(1))
+        if vartype == "SPIN":
+            sub, sub_const = Model.qubo_to_ising(sub, 0.0)
+            offset += sub_const
+        components.append(Component(sub, [order[p] for p in positions]))
+
+    fixed = {
+        order[i]: _to_vartype(int(values[i]), vartype)
+        for i in np.flatnonzero(values >= 0)
+    }
+    return Reduction(vartype, float(offset), fixed, components)
+
+
+def restore_solution(
+    reduction: Reduction, solutions: List[Dict[str, int]]
+) -> Dict[str, int]:
+    result = dict(reduction.fixed)
+    for solution in solutions:
+        result.update(solution)
+    return result
+
+
+def _fix_variables(matrix: np.ndarray):
+    # x_i = 0 is optimal if its gain is nonnegative for any other values, and
+    # x_i = 1 if it is nonpositive. The bounds hold whatever the other variables
+    # are, so all the variables found in a pass are fixed at once.
+    n = len(matrix)
+    couplings = matrix - np.diag(matrix.diagonal())
+    values = np.full(n, -1)
+    while True:
+        free = values < 0
+        ones = values == 1
+        linear = matrix.diagonal() + couplings[:, ones].sum(axis=1)
+        lower = linear + np.minimum(couplings[:, free], 0).sum(axis=1)
+        upper = linear + np.maximum(couplings[:, free], 0).sum(axis=1)
+        to_zero = free & (lower >= 0)
+        to_one = free & ~to_zero & (upper <= 0)
+        if not np.any(to_zero | to_one):
+            break
+        values[to_zero] = 0
+        values[to_one] = 1
+
+    ones = values == 1
+    offset = matrix.diagonal()[ones].sum() + couplings[np.ix_(ones, ones)].sum() / 2
+    return values, offset
+
+
+def _connected_components(matrix: np.ndarray) -> List[np.ndarray]:
+    adjacency = (matrix != 0) & ~np.eye(len(matrix), dtype=bool)
+    unvisited = np.ones(len(matrix), dtype=bool)
+    components = []
+    while np.any(unvisited):
+        reached = np.zeros(len(matrix), dtype=bool)
+        frontier = np.zeros(len(matrix), dtype=bool)
+        frontier[np.argmax(unvisited)] = True
+        while np.any(frontier):
+            reached |= frontier
+            frontier = adjacency[frontier].any(axis=0) & ~reached
+        unvisited &= ~reached
+        components.append(np.flatnonzero(reached))
+    return components
+
+
+def _to_vartype(value: int, vartype: str) -> int:
+    return 2 * value - 1 if vartype == "SPIN" else value
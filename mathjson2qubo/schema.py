@@ -0,0 +1,86 @@
+from typing import List, Tuple, TypedDict, Union, cast
+
+ENCODINGS = ("log", "unary", "one-hot")
+
+
+class _VariableBase(TypedDict):
+    symbol: str
+    dimension: int
+    type: str
+    size: Union[int, list]
+
+
+class Variable(_VariableBase, total=False):
+    # only for `INTEGER` variables
+    encoding: str
+    lower: int
+    upper: int
+    penalty: float
+
+
+class Constant(TypedDict):
+    symbol: str
+    values: Union[int, float, list]
+
+
+class ObjectiveTerm(TypedDict):
+    label: str
+    tex: dict
+    weight: float
+
+
+class ConstraintTerm(TypedDict):
+    label: str
+    tex: dict
+    weight: float
+
+
+def variable_shape(variable: Variable) -> Tuple[int, ...]:
+    if variable["dimension"] == 0:
+        return ()
+    if variable["dimension"] == 1:
+        return (cast(int, variable["size"]),)
+    return tuple(cast(list, variable["size"]))
+
+
+def constant_shape(values: Union[int, float, list]) -> Tuple[int, ...]:
+    shape = []
+    while isinstance(values, list):
+        shape.append(len(values))
+        values = values[0] if len(values) > 0 else None
+    return tuple(shape)
+
+
+def flatten(values: Union[int, float, list]) -> list:
+    if isinstance(values, list):
+        return [v for value in values for v in flatten(value)]
+    return [values]
+
+
+def encoding_coefficients(encoding: str, width: int) -> List[int]:
+    if width <= 0:
+        return []
+    if encoding == "unary":
+        return [1] * width
+    if encoding == "one-hot":
+        return list(range(width + 1))
+    # powers of 2 whose last coefficient is cut so that the maximum is `width`
+    n = width.bit_length()
+    return [2 ** k for k in range(n - 1)] + [width - 2 ** (n - 1) + 1]
+
+
+def variable_coefficients(variable: Variable) -> List[int]:
+    if variable["type"] != "INTEGER":
+        return [1]
+    return encoding_coefficients(
+        variable.get("encoding", "log"),
+        variable["upper"] - variable.get("lower", 0),
+    )
+
+
+def variable_interval(variable: Variable) -> Tuple[float, float]:
+    if variable["type"] == "INTEGER":
+        return float(variable.get("lower", 0)), float(variable["upper"])
+    if variable["type"] == "SPIN":
+        return -1.0, 1.0
+    return 0.0, 1.0
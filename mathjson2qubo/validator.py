@@ -0,0 +1,600 @@
+import math
+from functools import reduce
+from typing import List, Optional, Set, Tuple, Union, cast
+
+from mathjson2qubo.errors import (
+    CalculationError,
+    MathJsonFormatError,
+    MathJsonValidationError,
+    ParserError,
+    ParserInitArgumentsError,
+    SubScriptError,
+    SumFunctionError,
+    SuperScriptError,
+    VariableAccessError,
+)
+from mathjson2qubo.schema import (
+    ENCODINGS,
+    Constant,
+    ConstraintTerm,
+    ObjectiveTerm,
+    Variable,
+    constant_shape,
+    flatten,
+    variable_shape,
+)
+
+FUNCTIONS = ("add", "multiply", "subtract", "divide", "negate", "list", "sum")
+# only allowed at the top of a constraint
+INEQUALITIES = ("lessequal", "greaterequal")
+
+Issue = Tuple[str, ParserError]
+Value = Union[None, float, Tuple[float, ...]]
+# statically known value of a node and whether it depends on a decision variable
+Info = Tuple[Value, bool]
+
+
+class Validator:
+    def __init__(self, variables: List[Variable], constants: List[Constant] = []):
+        if len(variables) == 0:
+            raise ParserInitArgumentsError(code=1001, message="variable is required.")
+
+        for variable in variables:
+            self._validate_variable(variable)
+
+        self.variables = {v["symbol"]: v for v in variables}
+        self.constants = {c["symbol"]: c["values"] for c in constants}
+
+    @staticmethod
+    def _validate_variable(variable: Variable) -> None:
+        if len(variable["symbol"]) != 1:
+            raise ParserInitArgumentsError(
+                code=1002, message="variable symbol must be one character."
+            )
+
+        if variable["dimension"] < 0:
+            raise ParserInitArgumentsError(
+                code=1003, message="variable dimension must be positive integer."
+            )
+
+        if variable["dimension"] == 1 and not isinstance(variable["size"], int):
+            raise ParserInitArgumentsError(
+                code=1004,
+                message="if variable dimension is 1, variable size must be int.",
+            )
+
+        if variable["dimension"] >= 2 and not isinstance(variable["size"], list):
+            raise ParserInitArgumentsError(
+                code=1005,
+                message="if variable dimension is larger than 1, variable size must be list.",
+            )
+
+        if variable["type"] == "INTEGER":
+            lower, upper = variable.get("lower", 0), variable.get("upper")
+            if (
+                not isinstance(lower, int)
+                or not isinstance(upper, int)
+                or upper <= lower
+            ):
+                raise ParserInitArgumentsError(
+                    code=1006,
+                    message="integer variable requires integer `upper` larger than `lower`.",
+                )
+            if variable.get("encoding", "log") not in ENCODINGS:
+                raise ParserInitArgumentsError(
+                    code=1007,
+                    message="encoding must be one of {}.".format(", ".join(ENCODINGS)),
+                )
+
+    def _sym(self, arg: dict, path: str, index: Set[str], errors: List[Issue]) -> Info:
+        symbol = arg["sym"]
+        if symbol in index:
+            return None, False
+
+        if symbol in self.variables:
+            target, has_var = self.variables[symbol], True
+            shape = variable_shape(target)
+        elif symbol in self.constants:
+            target, has_var = self.constants[symbol], False
+            shape = constant_shape(target)
+        else:
+            errors.append(
+                (
+                    path,
+                    VariableAccessError(code=3001, message="not found the variable."),
+                )
+            )
+            return None, False
+
+        if "sub" not in arg:
+            value = float(target) if isinstance(target, (int, float)) else None
+            return (None if has_var else value), has_var
+
+        sub_path = path + ".sub"
+        subscript, sub_has_var = self._walk(arg["sub"], sub_path, index, errors)
+        if sub_has_var:
+            errors.append(
+                (
+                    sub_path,
+                    SubScriptError(code=6001, message="subscript must be integer."),
+                )
+            )
+            return None, has_var
+
+        if isinstance(subscript, float):
+            subscript = (subscript,)
+        if subscript is None:
+            return None, has_var
+        if any(not float.is_integer(s) for s in subscript):
+            errors.append(
+                (
+                    sub_path,
+                    SubScriptError(code=6001, message="subscript must be integer."),
+                )
+            )
+        elif len(subscript) > len(shape) or any(
+            not 1 <= s <= n for s, n in zip(subscript, shape)
+        ):
+            errors.append(
+                (
+                    sub_path,
+                    VariableAccessError(
+                        code=3002, message="variable index is out of range."
+                    ),
+                )
+            )
+        return None, has_var
+
+    def _sum(self, arg: dict, path: str, index: Set[str], errors: List[Issue]) -> Info:
+        bound = index
+        if isinstance(arg.get("sub"), dict) and arg["sub"].get("fn") == "elementof":
+            bound = index | set(self._sum_domain(arg["sub"], path + ".sub", errors))
+        elif "sub" not in arg or "sup" not in arg:
+            errors.append(
+                (
+                    path,
+                    SumFunctionError(
+                        code=4001, message="sum function requires `sub` and `sup`."
+                    ),
+                )
+            )
+            idx_sym = _index_symbol(arg.get("sub"))
+            bound = index if idx_sym is None else index | {idx_sym}
+        elif isinstance(arg["sub"], dict) and arg["sub"].get("fn") == "list":
+            subs = arg["sub"].get("arg") or []
+            sups = None
+            if isinstance(arg["sup"], dict) and arg["sup"].get("fn") == "list":
+                sups = arg["sup"].get("arg")
+            if not isinstance(sups, list) or len(subs) != len(sups):
+                errors.append(
+                    (
+                        path + ".sup",
+                        SumFunctionError(
+                            code=4007,
+                            message="sub and sup of multi-index sum function must have the same length.",
+                        ),
+                    )
+                )
+                sups = [None] * len(subs)
+            for i, (sub, sup) in enumerate(zip(subs, sups)):
+                idx_sym = self._sum_index(
+                    sub,
+                    sup,
+                    "{}.sub.arg[{}]".format(path, i),
+                    "{}.sup.arg[{}]".format(path, i),
+                    index,
+                    errors,
+                )
+                bound = bound if idx_sym is None else bound | {idx_sym}
+        else:
+            idx_sym = self._sum_index(
+                arg["sub"], arg["sup"], path + ".sub", path + ".sup", index, errors
+            )
+            bound = index if idx_sym is None else index | {idx_sym}
+
+        if not self._check_args(arg, path, errors):
+            return None, False
+        _, has_var = self._walk(arg["arg"][0], path + ".arg[0]", bound, errors)
+        return None, has_var
+
+    def _sum_domain(self, sub: dict, path: str, errors: List[Issue]) -> List[str]:
+        if not isinstance(sub.get("arg"), list) or len(sub["arg"]) != 2:
+            errors.append(
+                (
+                    path + ".arg",
+                    SumFunctionError(
+                        code=4004,
+                        message="subscript of sum function must be the equation of 2 elements.",
+                    ),
+                )
+            )
+            return []
+
+        target, domain = sub["arg"]
+        for n, a in enumerate(sub["arg"]):
+            if not isinstance(a, dict):
+                errors.append(("{}.arg[{}]".format(path, n), _format_error()))
+        if not isinstance(target, dict) or not isinstance(domain, dict):
+            return []
+        idx_args = target.get("arg", []) if target.get("fn") == "list" else [target]
+        if any(not isinstance(a, dict) or "sym" not in a for a in idx_args):
+            errors.append(
+                (
+                    path + ".arg[0]",
+                    SumFunctionError(
+                        code=4003,
+                        message="sum function requires an index variable (not constant).",
+                    ),
+                )
+            )
+            return []
+        idx_syms = [a["sym"] for a in idx_args]
+
+        domain_path = path + ".arg[1]"
+        is_support = domain.get("fn") == "support"
+        if (
+            is_support
+            and isinstance(domain.get("arg"), list)
+            and len(domain["arg"]) == 1
+        ):
+            domain, domain_path = domain["arg"][0], domain_path + ".arg[0]"
+        if (
+            not isinstance(domain, dict)
+            or "sym" not in domain
+            or "sub" in domain
+            or domain["sym"] in self.variables
+        ):
+            errors.append(
+                (
+                    domain_path,
+                    SumFunctionError(
+                        code=4008,
+                        message="domain of sum function must be a constant index set.",
+                    ),
+                )
+            )
+            return idx_syms
+        if domain["sym"] not in self.constants:
+            errors.append(
+                (
+                    domain_path,
+                    VariableAccessError(code=3001, message="not found the variable."),
+                )
+            )
+            return idx_syms
+
+        values = self.constants[domain["sym"]]
+        shape = constant_shape(values)
+        if is_support:
+            num_indices = len(shape)
+        elif len(shape) in (1, 2) and all(
+            isinstance(v, (int, float)) and float(v).is_integer()
+            for v in flatten(values)
+        ):
+            num_indices = 1 if len(shape) == 1 else shape[1]
+            if any(v < 1 for v in flatten(values)):
+                errors.append(
+                    (
+                        domain_path,
+                        VariableAccessError(
+                            code=3002, message="variable index is out of range."
+                        ),
+                    )
+                )
+        else:
+            errors.append(
+                (
+                    domain_path,
+                    SumFunctionError(
+                        code=4008,
+                        message="domain of sum function must be a constant index set.",
+                    ),
+                )
+            )
+            return idx_syms
+
+        if num_indices != len(idx_syms):
+            errors.append(
+                (
+                    path + ".arg[0]",
+                    SumFunctionError(
+                        code=4009,
+                        message="number of indices does not match the domain of sum function.",
+                    ),
+                )
+            )
+        return idx_syms
+
+    def _sum_index(
+        self,
+        sub: dict,
+        sup: Optional[dict],
+        sub_path: str,
+        sup_path: str,
+        index: Set[str],
+        errors: List[Issue],
+    ) -> Optional[str]:
+        # the index is bound even if the sum is malformed to avoid cascading errors
+        idx_sym = _index_symbol(sub)
+        if not isinstance(sub, dict) or sub.get("fn") != "equal":
+            errors.append(
+                (
+                    sub_path,
+                    SumFunctionError(
+                        code=4002,
+                        message="sub script of sum function must be equal function.",
+                    ),
+                )
+            )
+        elif idx_sym is None:
+            errors.append(
+                (
+                    sub_path + ".arg[0]",
+                    SumFunctionError(
+                        code=4003,
+                        message="sum function requires an index variable (not constant).",
+                    ),
+                )
+            )
+        elif len(sub["arg"]) != 2:
+            errors.append(
+                (
+                    sub_path + ".arg",
+                    SumFunctionError(
+                        code=4004,
+                        message="subscript of sum function must be the equation of 2 elements.",
+                    ),
+                )
+            )
+        else:
+            bounds = [
+                (sub_path + ".arg[1]", sub["arg"][1], 4005, "start"),
+                (sup_path, sup, 4006, "end"),
+            ]
+            for bound_path, node, code, name in bounds:
+                if node is None:
+                    continue
+                value, has_var = self._walk(node, bound_path, index, errors)
+                if has_var or (value is not None and not _is_integer(value)):
+                    errors.append(
+                        (
+                            bound_path,
+                            SumFunctionError(
+                                code=code,
+                                message="{} index of sum function must be integer.".format(
+                                    name
+                                ),
+                            ),
+                        )
+                    )
+        return idx_sym
+
+    def _fn(self, arg: dict, path: str, index: Set[str], errors: List[Issue]) -> Info:
+        if arg["fn"] not in FUNCTIONS:
+            errors.append(
+                (
+                    path + ".fn",
+                    MathJsonFormatError(
+                        code=2002, message="unknown function `{}`.".format(arg["fn"])
+                    ),
+                )
+            )
+        if arg["fn"] == "sum":
+            return self._sum(arg, path, index, errors)
+        if not self._check_args(arg, path, errors):
+            return None, False
+
+        infos = [
+            self._walk(a, "{}.arg[{}]".format(path, i), index, errors)
+            for i, a in enumerate(arg["arg"])
+        ]
+        values = [value for value, _ in infos]
+        has_var = any(has_var for _, has_var in infos)
+
+        if arg["fn"] == "list":
+            if all(isinstance(v, float) for v in values):
+                return tuple(cast(List[float], values)), has_var
+            return None, has_var
+
+        if arg["fn"] == "divide" and len(values) > 1 and values[1] == 0:
+            errors.append(
+                (
+                    path + ".arg[1]",
+                    CalculationError(code=5001, message="zero division error."),
+                )
+            )
+            return None, has_var
+
+        if has_var or not all(isinstance(v, float) for v in values):
+            return None, has_var
+        return _evaluate(arg["fn"], cast(List[float], values)), False
+
+    @staticmethod
+    def _check_args(arg: dict, path: str, errors: List[Issue]) -> bool:
+        if isinstance(arg.get("arg"), list) and len(arg["arg"]) > 0:
+            return True
+        errors.append(
+            (
+                path + ".arg",
+                MathJsonFormatError(
+                    code=2003, message="function requires non-empty `arg` list."
+                ),
+            )
+        )
+        return False
+
+    def _walk(self, arg: dict, path: str, index: Set[str], errors: List[Issue]) -> Info:
+        if not isinstance(arg, dict):
+            value, has_var = None, False
+            errors.append((path, _format_error()))
+        elif "sym" in arg:
+            value, has_var = self._sym(arg, path, index, errors)
+        elif "num" in arg:
+            try:
+                value, has_var = float(arg["num"]), False
+            except (TypeError, ValueError):
+                value, has_var = None, False
+                errors.append(
+                    (
+                        path + ".num",
+                        MathJsonFormatError(code=2004, message="num must be a number."),
+                    )
+                )
+        elif "fn" in arg:
+            value, has_var = self._fn(arg, path, index, errors)
+            if arg["fn"] == "sum":
+                return value, has_var
+        else:
+            value, has_var = None, False
+            errors.append((path, _format_error()))
+
+        if isinstance(arg, dict) and "sup" in arg:
+            return self._sup(value, has_var, arg, path, index, errors)
+        return value, has_var
+
+    def _sup(
+        self,
+        base: Value,
+        base_has_var: bool,
+        arg: dict,
+        path: str,
+        index: Set[str],
+        errors: List[Issue],
+    ) -> Info:
+        sup_path = path + ".sup"
+        if isinstance(base, tuple):
+            errors.append(
+                (
+                    path,
+                    SuperScriptError(code=7001, message="cardinal must not be list."),
+                )
+            )
+            return None, base_has_var
+
+        superscript, has_var = self._walk(arg["sup"], sup_path, index, errors)
+        if has_var or isinstance(superscript, tuple):
+            errors.append(
+                (sup_path, SuperScriptError(code=7002, message="index must be number."))
+            )
+            return None, base_has_var
+
+        if superscript is None:
+            return None, base_has_var
+        if not math.isfinite(superscript):
+            errors.append(
+                (sup_path, SuperScriptError(code=7002, message="index must be number."))
+            )
+            return None, base_has_var
+        if base_has_var and int(superscript) >= 3:
+            errors.append(
+                (
+                    sup_path,
+                    SuperScriptError(
+                        code=7003, message="must not include a cubic (and more) term."
+                    ),
+                )
+            )
+        if base is None:
+            return None, base_has_var
+        try:
+            value = base ** int(superscript)
+        except ZeroDivisionError:
+            errors.append(
+                (path, CalculationError(code=5001, message="zero division error."))
+            )
+            return None, base_has_var
+        except OverflowError:
+            # too large to fold, the value is left unknown
+            return None, base_has_var
+        return value, base_has_var
+
+    def check_mathjson(self, arg: dict, path: str = "$") -> List[Issue]:
+        errors: List[Issue] = []
+        self._walk(arg, path, set(), errors)
+        return errors
+
+    def validate_mathjson(self, arg: dict) -> None:
+        errors = self.check_mathjson(arg)
+        if len(errors) > 0:
+            raise MathJsonValidationError(errors, code=errors[0][1].code)
+
+    def check_inequality(self, arg: dict, path: str = "$") -> List[Issue]:
+        if not isinstance(arg.get("arg"), list) or len(arg["arg"]) != 2:
+            return [
+                (
+                    path + ".arg",
+                    MathJsonFormatError(
+                        code=2005, message="inequality requires 2 arguments."
+                    ),
+                )
+            ]
+        return [
+            issue
+            for i, side in enumerate(arg["arg"])
+            for issue in self.check_mathjson(side, "{}.arg[{}]".format(path, i))
+        ]
+
+    def validate(
+        self,
+        objectives: List[ObjectiveTerm] = [],
+        constraints: List[ConstraintTerm] = [],
+    ) -> None:
+        errors: List[Issue] = []
+        for name, terms in (("objectives", objectives), ("constraints", constraints)):
+            for i, term in enumerate(terms):
+                path = "$.{}[{}].tex".format(name, i)
+                if name == "constraints" and is_inequality(term["tex"]):
+                    errors += self.check_inequality(term["tex"], path)
+                else:
+                    errors += self.check_mathjson(term["tex"], path)
+        if len(errors) > 0:
+            raise MathJsonValidationError(errors, code=errors[0][1].code)
+
+
+def sum_bounds(arg: dict) -> List[Tuple[dict, dict]]:
+    if arg["sub"].get("fn") == "list":
+        return list(zip(arg["sub"]["arg"], arg["sup"]["arg"]))
+    return [(arg["sub"], arg["sup"])]
+
+
+def inequality_sides(arg: dict) -> Tuple[dict, dict]:
+    # normalized to `lhs <= rhs`
+    lhs, rhs = arg["arg"]
+    return (lhs, rhs) if arg["fn"] == "lessequal" else (rhs, lhs)
+
+
+def is_inequality(arg) -> bool:
+    return isinstance(arg, dict) and arg.get("fn") in INEQUALITIES
+
+
+def _format_error() -> MathJsonFormatError:
+    return MathJsonFormatError(
+        code=2001,
+        message="mathjson object must be has one of the following (sym, num, fn).",
+    )
+
+
+def _index_symbol(sub: Optional[dict]) -> Optional[str]:
+    if not isinstance(sub, dict) or not isinstance(sub.get("arg"), list):
+        return None
+    if len(sub["arg"]) == 0 or not isinstance(sub["arg"][0], dict):
+        return None
+    return sub["arg"][0].get("sym")
+
+
+def _is_integer(value: Value) -> bool:
+    return isinstance(value, float) and float.is_integer(value)
+
+
+def _evaluate(fn: str, values: List[float]) -> Optional[float]:
+    if fn == "add":
+        return reduce(lambda x, y: x + y, values)
+    if fn == "multiply":
+        return reduce(lambda x, y: x * y, values)
+    if fn == "subtract" and len(values) == 2:
+        return values[0] - values[1]
+    if fn == "divide" and len(values) == 2:
+        return values[0] / values[1]
+    if fn == "negate":
+        return -reduce(lambda x, y: x + y, values)
+    return None
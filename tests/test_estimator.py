@@ -0,0 +1,268 @@
+from expects import expect, raise_error
+from expects.matchers.built_in.equal import equal
+from mamba import before, context, description, it
+from mathjson2qubo.errors import (
+    MathJsonValidationError,
+    ModelSizeError,
+    ParserInitArgumentsError,
+)
+from mathjson2qubo.estimator import Estimator
+from mathjson2qubo.validator import Validator
+
+
+def _sum(sym, start, sup, body):
+    return {
+        "fn": "sum",
+        "sub": {"fn": "equal", "arg": [{"sym": sym}, start]},
+        "sup": sup,
+        "arg": [body],
+    }
+
+
+def _x(*indices):
+    if len(indices) == 1:
+        return {"sym": "x", "sub": {"sym": indices[0]}}
+    return {
+        "sym": "x",
+        "sub": {"fn": "list", "arg": [{"sym": i} for i in indices]},
+    }
+
+
+with description("Estimator") as self:
+    with before.each:
+        self.size = 5
+        self.estimator = Estimator(
+            Validator(
+                variables=[
+                    {"dimension": 1, "size": self.size, "symbol": "x", "type": "BINARY"}
+                ],
+                constants=[{"symbol": "N", "values": self.size}],
+            )
+        )
+
+    with description("__init__()"):
+        with context("call w/ unknown dtype"):
+            with it("raise ParserInitArgumentsError"):
+                expect(lambda: Estimator(self.estimator.validator, dtype="float16")).to(
+                    raise_error(ParserInitArgumentsError)
+                )
+
+    with description("estimate()"):
+        with context("integer variables and inequality"):
+            with it("count the encoded bits and the slack"):
+                estimator = Estimator(
+                    Validator(
+                        variables=[
+                            {
+                                "dimension": 1,
+                                "size": 3,
+                                "symbol": "n",
+                                "type": "INTEGER",
+                                "lower": 1,
+                                "upper": 6,
+                            },
+                            {
+                                "dimension": 0,
+                                "size": 0,
+                                "symbol": "m",
+                                "type": "INTEGER",
+                                "upper": 3,
+                                "encoding": "one-hot",
+                            },
+                        ],
+                    )
+                )
+                constraints = [
+                    {
+                        "label": "c",
+                        "weight": 1,
+                        "tex": {
+                            "fn": "lessequal",
+                            "arg": [
+                                {
+                                    "fn": "add",
+                                    "arg": [
+                                        {"sym": "n", "sub": {"num": 1}},
+                                        {"sym": "m"},
+                                    ],
+                                },
+                                {"num": 4},
+                            ],
+                        },
+                    }
+                ]
+                estimate = estimator.estimate(constraints=constraints)
+                # 3 x 3 bits of n, 4 bits of m and 2 bits of the slack in [0, 3]
+                expect(estimate["num_variables"]).to(equal(15))
+
+        with context("one-hot integer variable"):
+            with before.each:
+                self.estimator = Estimator(
+                    Validator(
+                        variables=[
+                            {
+                                "dimension": 1,
+                                "size": 10,
+                                "symbol": "n",
+                                "type": "INTEGER",
+                                "upper": 3,
+                                "encoding": "one-hot",
+                            },
+                        ],
+                        constants=[{"symbol": "N", "values": 10}],
+                    )
+                )
+
+            with it("count the penalty of the referred elements only"):
+                objectives = [
+                    {
+                        "label": "obj",
+                        "weight": 1,
+                        "tex": {"sym": "n", "sub": {"num": 2}},
+                    }
+                ]
+                estimate = self.estimator.estimate(objectives=objectives)
+                # 4 x 3 / 2 couplings of the bits of n[2]
+                expect(estimate["num_quadratic"]).to(equal(6))
+
+            with it("count the penalty of each element referred in sum"):
+                objectives = [
+                    {
+                        "label": "obj",
+                        "weight": 1,
+                        "tex": _sum(
+                            "i",
+                            {"num": 1},
+                            {"sym": "N"},
+                            {"sym": "n", "sub": {"sym": "i"}},
+                        ),
+                    }
+                ]
+                estimate = self.estimator.estimate(objectives=objectives)
+                expect(estimate["num_quadratic"]).to(equal(10 * 6))
+
+        with context("linear objective"):
+            with it("return the number of linear terms"):
+                objectives = [
+                    {
+                        "label": "obj",
+                        "weight": 1,
+                        "tex": _sum("i", {"num": 1}, {"sym": "N"}, _x("i")),
+                    }
+                ]
+                estimate = self.estimator.estimate(objectives=objectives)
+                expect(estimate["num_variables"]).to(equal(self.size))
+                expect(estimate["num_linear"]).to(equal(self.size))
+                expect(estimate["num_quadratic"]).to(equal(0))
+                expect(estimate["dense_bytes"]).to(equal(self.size * self.size * 8))
+
+            with it("size the memory by the coefficients of the dtype"):
+                objectives = [
+                    {
+                        "label": "obj",
+                        "weight": 1,
+                        "tex": _sum("i", {"num": 1}, {"sym": "N"}, _x("i")),
+                    }
+                ]
+                estimator = Estimator(self.estimator.validator, dtype="float32")
+                estimate = estimator.estimate(objectives=objectives)
+                expect(estimate["dense_bytes"]).to(equal(self.size * self.size * 4))
+                expect(estimate["sparse_bytes"]).to(equal(self.size * (4 + 2 * 8)))
+
+        with context("squared constraint"):
+            with it("return the number of pairs"):
+                tex = {
+                    "fn": "subtract",
+                    "arg": [_sum("i", {"num": 1}, {"sym": "N"}, _x("i")), {"num": 1}],
+                    "sup": {"num": 2},
+                }
+                constraints = [{"label": "c", "weight": 1, "tex": tex}]
+                estimate = self.estimator.estimate(constraints=constraints)
+                expect(estimate["num_linear"]).to(equal(self.size))
+                expect(estimate["num_quadratic"]).to(
+                    equal(self.size * (self.size - 1) // 2)
+                )
+
+        with context("bounds depend on the outer index"):
+            with it("return an upper bound of the number of terms"):
+                tex = _sum(
+                    "i",
+                    {"num": 1},
+                    {"sym": "N"},
+                    _sum(
+                        "j",
+                        {"fn": "add", "arg": [{"sym": "i"}, {"num": 1}]},
+                        {"sym": "N"},
+                        {"fn": "multiply", "arg": [_x("i"), _x("j")]},
+                    ),
+                )
+                estimate = self.estimator.estimate(
+                    objectives=[{"label": "obj", "weight": 1, "tex": tex}]
+                )
+                expect(estimate["num_quadratic"]).to(
+                    equal(self.size * (self.size - 1) // 2)
+                )
+
+        with context("sum over nonzero entries"):
+            with it("return the number of entries"):
+                estimator = Estimator(
+                    Validator(
+                        variables=[
+                            {"dimension": 1, "size": 3, "symbol": "x", "type": "BINARY"}
+                        ],
+                        constants=[
+                            {"symbol": "w", "values": [[0, 2, 0], [0, 0, 3], [0, 0, 0]]}
+                        ],
+                    )
+                )
+                tex = {
+                    "fn": "sum",
+                    "sub": {
+                        "fn": "elementof",
+                        "arg": [
+                            {"fn": "list", "arg": [{"sym": "i"}, {"sym": "j"}]},
+                            {"fn": "support", "arg": [{"sym": "w"}]},
+                        ],
+                    },
+                    "arg": [{"fn": "multiply", "arg": [_x("i"), _x("j")]}],
+                }
+                estimate = estimator.estimate(
+                    objectives=[{"label": "obj", "weight": 1, "tex": tex}]
+                )
+                expect(estimate["num_quadratic"]).to(equal(2))
+
+        with context("invalid mathjson"):
+            with it("raise MathJsonValidationError"):
+                objectives = [{"label": "obj", "weight": 1, "tex": {"sym": "y"}}]
+                expect(lambda: self.estimator.estimate(objectives=objectives)).to(
+                    raise_error(MathJsonValidationError)
+                )
+
+    with description("check()"):
+        with before.each:
+            tex = {
+                "fn": "subtract",
+                "arg": [_sum("i", {"num": 1}, {"sym": "N"}, _x("i")), {"num": 1}],
+                "sup": {"num": 2},
+            }
+            self.estimate = self.estimator.estimate(
+                constraints=[{"label": "c", "weight": 1, "tex": tex}]
+            )
+
+        with context("estimate is within the limits"):
+            with it("pass"):
+                expect(Estimator.check(self.estimate, max_variables=self.size)).to(
+                    equal(None)
+                )
+
+        with context("estimate exceeds the limits"):
+            with it("raise ModelSizeError"):
+                expect(lambda: Estimator.check(self.estimate, max_variables=1)).to(
+                    raise_error(ModelSizeError)
+                )
+                expect(lambda: Estimator.check(self.estimate, max_quadratic=1)).to(
+                    raise_error(ModelSizeError)
+                )
+                expect(lambda: Estimator.check(self.estimate, max_bytes=1)).to(
+                    raise_error(ModelSizeError)
+                )
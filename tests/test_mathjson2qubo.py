@@ -1,4 +1,5 @@
 import random
+import time
 
 from expects import expect, raise_error
 from expects.matchers.built_in.equal import equal
@@ -6,6 +7,7 @@ from mamba import before, context, description, it
 from mathjson2qubo.errors import (
     CalculationError,
     MathJsonFormatError,
+    MathJsonValidationError,
     ParserInitArgumentsError,
     SubScriptError,
     SumFunctionError,
@@ -72,6 +74,18 @@ with description("Parser") as self:
                     )
                     expect(parser.x).to(equal(Binary("x")))
 
+        with context("call with unknown dtype"):
+            with it("raise ParserInitArgumentsError"):
+                expect(
+                    lambda: Parser(
+                        vartype="SPIN",
+                        variables=[
+                            {"symbol": "s", "dimension": 0, "size": 0, "type": "SPIN"}
+                        ],
+                        dtype="int8",
+                    )
+                ).to(raise_error(ParserInitArgumentsError))
+
     with description("_fn_add()"):
         with it("return convorutional sum"):
             args = [1.0, 2.0, 3.0]
@@ -244,14 +258,12 @@ with description("Parser") as self:
                         }
                     ],
                 }
-                expect(self.parser._fn_sum(sum_valid_args)).to(
-                    equal(
-                        Sum(
-                            0,
-                            self.size,
-                            lambda i: self.constant_values[i] * self.parser.x[i],
-                        )
-                    )
+                # the terms are grouped differently from `Sum`, so compare the models
+                expected = Sum(
+                    0, self.size, lambda i: self.constant_values[i] * self.parser.x[i],
+                )
+                expect(self.parser._fn_sum(sum_valid_args).compile().to_qubo()).to(
+                    equal(expected.compile().to_qubo())
                 )
 
         with context("call w/ valid args (quadratic variable)"):
@@ -308,20 +320,378 @@ with description("Parser") as self:
                         }
                     ],
                 }
-                expect(self.parser._fn_sum(sum_valid_args)).to(
+                # nested sums are fused into one flat sum, so compare the models
+                expected = Sum(
+                    0,
+                    self.size,
+                    lambda i: Sum(
+                        0,
+                        self.size,
+                        lambda j: self.constants[i][j] * self.parser.x[i][j],
+                    ),
+                )
+                expect(self.parser._fn_sum(sum_valid_args).compile().to_qubo()).to(
+                    equal(expected.compile().to_qubo())
+                )
+
+            with it("return the same result w/ multi-index sum"):
+                sum_valid_args = {
+                    "fn": "sum",
+                    "sub": {
+                        "fn": "list",
+                        "arg": [
+                            {"fn": "equal", "arg": [{"sym": "i"}, {"num": 1}]},
+                            {"fn": "equal", "arg": [{"sym": "j"}, {"num": 1}]},
+                        ],
+                    },
+                    "sup": {"fn": "list", "arg": [{"sym": "N"}, {"sym": "N"}]},
+                    "arg": [
+                        {
+                            "fn": "multiply",
+                            "arg": [
+                                {
+                                    "sym": "n",
+                                    "sub": {
+                                        "fn": "list",
+                                        "arg": [{"sym": "i"}, {"sym": "j"}],
+                                    },
+                                },
+                                {
+                                    "sym": "x",
+                                    "sub": {
+                                        "fn": "list",
+                                        "arg": [{"sym": "i"}, {"sym": "j"}],
+                                    },
+                                },
+                            ],
+                        }
+                    ],
+                }
+                expected = Sum(
+                    0,
+                    self.size,
+                    lambda i: Sum(
+                        0,
+                        self.size,
+                        lambda j: self.constants[i][j] * self.parser.x[i][j],
+                    ),
+                )
+                expect(self.parser._fn_sum(sum_valid_args).compile().to_qubo()).to(
+                    equal(expected.compile().to_qubo())
+                )
+
+            with it("raise SumFunctionError if sub and sup of multi-index sum differ"):
+                sum_args = {
+                    "fn": "sum",
+                    "sub": {
+                        "fn": "list",
+                        "arg": [
+                            {"fn": "equal", "arg": [{"sym": "i"}, {"num": 1}]},
+                            {"fn": "equal", "arg": [{"sym": "j"}, {"num": 1}]},
+                        ],
+                    },
+                    "sup": {"fn": "list", "arg": [{"sym": "N"}]},
+                    "arg": [{"sym": "x", "sub": {"sym": "i"}}],
+                }
+                expect(lambda: self.parser._fn_sum(sum_args)).to(
+                    raise_error(SumFunctionError)
+                )
+
+        with context("call w/ variable-free body"):
+            with it("return the sum as float"):
+                sum_args = {
+                    "fn": "sum",
+                    "sub": {"fn": "equal", "arg": [{"sym": "i"}, {"num": 1}]},
+                    "sup": {"sym": "N"},
+                    "arg": [{"sym": "n", "sub": {"sym": "i"}, "sup": {"num": 2}}],
+                }
+                expect(self.parser._fn_sum(sum_args)).to(
+                    equal(float(sum(v ** 2 for v in self.constant_values)))
+                )
+
+        with context("call w/ nested variable-free body whose bound depends on index"):
+            with it("return the sum as float"):
+                sum_args = {
+                    "fn": "sum",
+                    "sub": {"fn": "equal", "arg": [{"sym": "i"}, {"num": 1}]},
+                    "sup": {"sym": "N"},
+                    "arg": [
+                        {
+                            "fn": "sum",
+                            "sub": {"fn": "equal", "arg": [{"sym": "j"}, {"sym": "i"}]},
+                            "sup": {"sym": "N"},
+                            "arg": [
+                                {
+                                    "fn": "multiply",
+                                    "arg": [
+                                        {"sym": "n", "sub": {"sym": "i"}},
+                                        {"sym": "n", "sub": {"sym": "j"}},
+                                    ],
+                                }
+                            ],
+                        }
+                    ],
+                }
+                values = self.constant_values
+                expect(self.parser._fn_sum(sum_args)).to(
                     equal(
-                        Sum(
-                            0,
-                            self.size,
-                            lambda i: Sum(
-                                0,
-                                self.size,
-                                lambda j: self.constants[i][j] * self.parser.x[i][j],
-                            ),
+                        float(
+                            sum(
+                                values[i] * values[j]
+                                for i in range(self.size)
+                                for j in range(i, self.size)
+                            )
                         )
                     )
                 )
 
+        with context("call w/ nested sum whose inner range is empty at the end"):
+            with it("return the pairwise sum"):
+                sum_args = {
+                    "fn": "sum",
+                    "sub": {"fn": "equal", "arg": [{"sym": "i"}, {"num": 1}]},
+                    "sup": {"sym": "N"},
+                    "arg": [
+                        {
+                            "fn": "sum",
+                            "sub": {
+                                "fn": "equal",
+                                "arg": [
+                                    {"sym": "j"},
+                                    {"fn": "add", "arg": [{"sym": "i"}, {"num": 1}]},
+                                ],
+                            },
+                            "sup": {"sym": "N"},
+                            "arg": [
+                                {
+                                    "fn": "multiply",
+                                    "arg": [
+                                        {"sym": "x", "sub": {"sym": "i"}},
+                                        {"sym": "x", "sub": {"sym": "j"}},
+                                    ],
+                                }
+                            ],
+                        }
+                    ],
+                }
+                x = self.parser.x
+                expected = sum(
+                    x[i] * x[j]
+                    for i in range(self.size)
+                    for j in range(i + 1, self.size)
+                )
+                expect(self.parser._fn_sum(sum_args).compile().to_qubo()).to(
+                    equal(expected.compile().to_qubo())
+                )
+
+        with context("call w/ variable-free body undefined out of the index range"):
+            with it("return the sum w/o zero division"):
+                sum_args = {
+                    "fn": "sum",
+                    "sub": {"fn": "equal", "arg": [{"sym": "i"}, {"num": 1}]},
+                    "sup": {"sym": "N"},
+                    "arg": [
+                        {
+                            "fn": "sum",
+                            "sub": {
+                                "fn": "equal",
+                                "arg": [
+                                    {"sym": "j"},
+                                    {"fn": "add", "arg": [{"sym": "i"}, {"num": 1}]},
+                                ],
+                            },
+                            "sup": {"sym": "N"},
+                            "arg": [
+                                {
+                                    "fn": "divide",
+                                    "arg": [
+                                        {"num": 1},
+                                        {
+                                            "fn": "subtract",
+                                            "arg": [{"sym": "j"}, {"sym": "i"}],
+                                        },
+                                    ],
+                                }
+                            ],
+                        }
+                    ],
+                }
+                expect(self.parser._fn_sum(sum_args)).to(
+                    equal(
+                        sum(
+                            1 / (j - i)
+                            for i in range(self.size)
+                            for j in range(i + 1, self.size)
+                        )
+                    )
+                )
+
+            with it("return the sum w/o out of range access"):
+                sum_args = {
+                    "fn": "sum",
+                    "sub": {"fn": "equal", "arg": [{"sym": "i"}, {"num": 1}]},
+                    "sup": {"sym": "N"},
+                    "arg": [
+                        {
+                            "fn": "sum",
+                            "sub": {"fn": "equal", "arg": [{"sym": "j"}, {"sym": "i"}]},
+                            "sup": {"sym": "N"},
+                            "arg": [
+                                {
+                                    "sym": "n",
+                                    "sub": {
+                                        "fn": "add",
+                                        "arg": [
+                                            {"sym": "N"},
+                                            {
+                                                "fn": "subtract",
+                                                "arg": [{"sym": "i"}, {"sym": "j"}],
+                                            },
+                                        ],
+                                    },
+                                }
+                            ],
+                        }
+                    ],
+                }
+                values = self.constant_values
+                expect(self.parser._fn_sum(sum_args)).to(
+                    equal(
+                        float(
+                            sum(
+                                values[self.size - 1 + i - j]
+                                for i in range(self.size)
+                                for j in range(i, self.size)
+                            )
+                        )
+                    )
+                )
+
+        with context("call w/ variable-free body whose index is out of range"):
+            with it("raise VariableAccessError"):
+                sum_args = {
+                    "fn": "sum",
+                    "sub": {"fn": "equal", "arg": [{"sym": "i"}, {"num": 1}]},
+                    "sup": {"num": self.size + 1},
+                    "arg": [{"sym": "n", "sub": {"sym": "i"}}],
+                }
+                expect(lambda: self.parser._fn_sum(sum_args)).to(
+                    raise_error(VariableAccessError)
+                )
+
+        with context("call w/ sparse index domain"):
+            with before.each:
+                self.weights = [[0, 2, 0], [0, 0, 3], [0, 0, 0]]
+                self.parser = Parser(
+                    vartype="BINARY",
+                    variables=[
+                        {"dimension": 1, "size": 3, "symbol": "x", "type": "BINARY"}
+                    ],
+                    constants=[
+                        {"symbol": "w", "values": self.weights},
+                        {"symbol": "E", "values": [[1, 2], [2, 3]]},
+                        {"symbol": "F", "values": [[0, 1], [1, 2]]},
+                        {"symbol": "G", "values": [[2, 4]]},
+                        {"symbol": "v", "values": [1, 1, 1]},
+                    ],
+                )
+                self.body = {
+                    "fn": "multiply",
+                    "arg": [
+                        {
+                            "sym": "w",
+                            "sub": {"fn": "list", "arg": [{"sym": "i"}, {"sym": "j"}]},
+                        },
+                        {"sym": "x", "sub": {"sym": "i"}},
+                        {"sym": "x", "sub": {"sym": "j"}},
+                    ],
+                }
+                x = self.parser.x
+                self.expected = 2.0 * x[0] * x[1] + 3.0 * x[1] * x[2]
+
+            with it("iterate over nonzero entries of the constant"):
+                sum_args = {
+                    "fn": "sum",
+                    "sub": {
+                        "fn": "elementof",
+                        "arg": [
+                            {"fn": "list", "arg": [{"sym": "i"}, {"sym": "j"}]},
+                            {"fn": "support", "arg": [{"sym": "w"}]},
+                        ],
+                    },
+                    "arg": [self.body],
+                }
+                expect(self.parser._fn_sum(sum_args).compile().to_qubo()).to(
+                    equal(self.expected.compile().to_qubo())
+                )
+
+            with it("iterate over the index list"):
+                sum_args = {
+                    "fn": "sum",
+                    "sub": {
+                        "fn": "elementof",
+                        "arg": [
+                            {"fn": "list", "arg": [{"sym": "i"}, {"sym": "j"}]},
+                            {"sym": "E"},
+                        ],
+                    },
+                    "arg": [self.body],
+                }
+                expect(self.parser._fn_sum(sum_args).compile().to_qubo()).to(
+                    equal(self.expected.compile().to_qubo())
+                )
+
+            with it("return the sum as float w/ variable-free body"):
+                sum_args = {
+                    "fn": "sum",
+                    "sub": {
+                        "fn": "elementof",
+                        "arg": [
+                            {"fn": "list", "arg": [{"sym": "i"}, {"sym": "j"}]},
+                            {"fn": "support", "arg": [{"sym": "w"}]},
+                        ],
+                    },
+                    "arg": [
+                        {
+                            "sym": "w",
+                            "sub": {"fn": "list", "arg": [{"sym": "i"}, {"sym": "j"}]},
+                        }
+                    ],
+                }
+                expect(self.parser._fn_sum(sum_args)).to(equal(5.0))
+
+            with it("raise SumFunctionError if the number of indices does not match"):
+                sum_args = {
+                    "fn": "sum",
+                    "sub": {"fn": "elementof", "arg": [{"sym": "i"}, {"sym": "E"}]},
+                    "arg": [{"sym": "x", "sub": {"sym": "i"}}],
+                }
+                expect(lambda: self.parser._fn_sum(sum_args)).to(
+                    raise_error(SumFunctionError)
+                )
+
+            with it("raise VariableAccessError if an index is out of range"):
+                for domain in ["F", "G"]:
+                    # the body w/ a variable and the variable-free body
+                    for body in [
+                        {"sym": "x", "sub": {"sym": "j"}},
+                        {"sym": "v", "sub": {"sym": "j"}},
+                    ]:
+                        sum_args = {
+                            "fn": "sum",
+                            "sub": {
+                                "fn": "elementof",
+                                "arg": [
+                                    {"fn": "list", "arg": [{"sym": "i"}, {"sym": "j"}]},
+                                    {"sym": domain},
+                                ],
+                            },
+                            "arg": [body],
+                        }
+                        expect(lambda: self.parser._fn_sum(sum_args)).to(
+                            raise_error(VariableAccessError)
+                        )
+
     with description("_sup()"):
         with context("call w/ valid args"):
             with it("return the calcuration result"):
@@ -519,3 +889,361 @@ with description("Parser") as self:
             with it(""):
                 arg = {"num": 10, "sup": {"num": 2}}
                 expect(self.parser.parse_mathjson(arg)).to(equal(10 ** 2))
+
+    with description("parse_to_pyqubo_model()"):
+        with context("invalid mathjson"):
+            with it("raise the error before evaluation"):
+                objectives = [
+                    {
+                        "label": "obj",
+                        "weight": 1,
+                        "tex": {
+                            "fn": "sum",
+                            "sub": {"fn": "equal", "arg": [{"sym": "i"}, {"num": 1}]},
+                            "sup": {"num": 10 ** 9},
+                            "arg": [{"sym": "x", "sub": {"num": 5}}],
+                        },
+                    }
+                ]
+                expect(
+                    lambda: self.parser.parse_to_pyqubo_model(objectives=objectives)
+                ).to(raise_error(VariableAccessError))
+
+        with context("mathjson with several errors"):
+            with it("raise MathJsonValidationError with the code of the first error"):
+                objectives = [
+                    {
+                        "label": "obj",
+                        "weight": 1,
+                        "tex": {
+                            "fn": "add",
+                            "arg": [
+                                {"sym": "x", "sub": {"num": 1.5}},
+                                {"sym": "x", "sub": {"num": 5}},
+                            ],
+                        },
+                    }
+                ]
+                try:
+                    self.parser.parse_to_pyqubo_model(objectives=objectives)
+                except MathJsonValidationError as e:
+                    error = e
+                expect(error.code).to(equal(6001))
+                expect(len(error.errors)).to(equal(2))
+
+    with description("estimate()"):
+        with it("return the estimated model size"):
+            objectives = [
+                {
+                    "label": "obj",
+                    "weight": 1,
+                    "tex": {
+                        "fn": "multiply",
+                        "arg": [
+                            {"sym": "x", "sub": {"num": 1}},
+                            {"sym": "x", "sub": {"num": 2}},
+                        ],
+                    },
+                }
+            ]
+            estimate = self.parser.estimate(objectives=objectives)
+            expect(estimate["num_variables"]).to(equal(4))
+            expect(estimate["num_quadratic"]).to(equal(1))
+
+        with it("size the memory by the dtype of the parser"):
+            parser = Parser(
+                vartype="BINARY",
+                variables=[
+                    {"dimension": 1, "size": 4, "symbol": "x", "type": "BINARY"}
+                ],
+                dtype="int32",
+            )
+            estimate = parser.estimate(
+                objectives=[
+                    {
+                        "label": "obj",
+                        "weight": 1,
+                        "tex": {"sym": "x", "sub": {"num": 1}},
+                    }
+                ]
+            )
+            expect(estimate["dense_bytes"]).to(equal(4 * 4 * 4))
+
+    with description("integer variables"):
+        with before.each:
+            self.integer_parser = Parser(
+                vartype="SPIN",
+                variables=[
+                    {
+                        "dimension": 1,
+                        "size": 2,
+                        "symbol": "n",
+                        "type": "INTEGER",
+                        "lower": 1,
+                        "upper": 6,
+                    },
+                    {
+                        "dimension": 0,
+                        "size": 0,
+                        "symbol": "m",
+                        "type": "INTEGER",
+                        "upper": 3,
+                        "encoding": "one-hot",
+                        "penalty": 10,
+                    },
+                ],
+            )
+
+        with context("log encoding"):
+            with it("expand into binary variables whose maximum is upper"):
+                model = self.integer_parser.parse_to_pyqubo_model(
+                    objectives=[
+                        {
+                            "label": "obj",
+                            "weight": 1,
+                            "tex": {"sym": "n", "sub": {"num": 1}},
+                        }
+                    ]
+                )
+                expect(model.variable_order).to(
+                    equal(["n[0][0]", "n[0][1]", "n[0][2]"])
+                )
+                qubo, offset = model.to_qubo(feed_dict={"obj": 1})
+                expect(sum(qubo.values()) + offset).to(equal(6))
+
+        with context("one-hot encoding"):
+            with it("add the penalty of the variable"):
+                model = self.integer_parser.parse_to_pyqubo_model(
+                    objectives=[{"label": "obj", "weight": 1, "tex": {"sym": "m"}}]
+                )
+                expect(list(model.constraints)).to(equal(["m_one_hot"]))
+
+        with context("solve with inequality"):
+            with it("return integer values which satisfy the inequality"):
+                objectives = [
+                    {
+                        "label": "obj",
+                        "weight": 1,
+                        "tex": {
+                            "fn": "negate",
+                            "arg": [{"sym": "n", "sub": {"num": 1}}],
+                        },
+                    },
+                    {
+                        "label": "m",
+                        "weight": 1,
+                        "tex": {"fn": "negate", "arg": [{"sym": "m"}]},
+                    },
+                ]
+                constraints = [
+                    {
+                        "label": "c",
+                        "weight": 10,
+                        "tex": {
+                            "fn": "greaterequal",
+                            "arg": [
+                                {"num": 5},
+                                {
+                                    "fn": "add",
+                                    "arg": [
+                                        {"sym": "n", "sub": {"num": 1}},
+                                        {"sym": "m"},
+                                    ],
+                                },
+                            ],
+                        },
+                    }
+                ]
+                decoded, broken, _ = self.integer_parser.solve(
+                    objectives=objectives, constraints=constraints, num_reads=20
+                )
+                expect(broken).to(equal({}))
+                expect(decoded["n"][0] + decoded["m"]).to(equal(5))
+                expect(set(decoded)).to(equal({"n", "m"}))
+
+        with context("solve w/ an element which is not referred"):
+            with it("return only the values of the referred elements"):
+                objectives = [
+                    {
+                        "label": "obj",
+                        "weight": 1,
+                        "tex": {
+                            "fn": "negate",
+                            "arg": [{"sym": "n", "sub": {"num": 2}}],
+                        },
+                    }
+                ]
+                decoded, _, _ = self.integer_parser.solve(
+                    objectives=objectives, num_reads=20
+                )
+                expect(decoded["n"]).to(equal({1: 6}))
+
+            with it("add the one-hot penalty of the referred elements only"):
+                for vartype in ["SPIN", "BINARY"]:
+                    parser = Parser(
+                        vartype=vartype,
+                        variables=[
+                            {
+                                "dimension": 1,
+                                "size": 3,
+                                "symbol": "n",
+                                "type": "INTEGER",
+                                "upper": 3,
+                                "encoding": "one-hot",
+                                "penalty": 10,
+                            }
+                        ],
+                    )
+                    objectives = [
+                        {
+                            "label": "obj",
+                            "weight": 1,
+                            "tex": {
+                                "fn": "negate",
+                                "arg": [{"sym": "n", "sub": {"num": 3}}],
+                            },
+                        }
+                    ]
+                    model = parser.parse_to_pyqubo_model(objectives=objectives)
+                    expect({label[:4] for label in model.variable_order}).to(
+                        equal({"n[2]"})
+                    )
+                    decoded, _, _ = parser.solve(objectives=objectives, num_reads=20)
+                    expect(decoded["n"]).to(equal({2: 3}))
+
+    with description("parse_to_matrix()"):
+        with context("dtype is int32"):
+            with it("return the matrix of int32"):
+                parser = Parser(
+                    vartype="BINARY",
+                    variables=[
+                        {"dimension": 1, "size": 2, "symbol": "x", "type": "BINARY"}
+                    ],
+                    dtype="int32",
+                )
+                tex = {
+                    "fn": "add",
+                    "arg": [
+                        {"sym": "x", "sub": {"num": 1}},
+                        {"sym": "x", "sub": {"num": 2}},
+                    ],
+                    "sup": {"num": 2},
+                }
+                matrix, const, _ = parser.parse_to_matrix(
+                    objectives=[{"label": "obj", "weight": 3, "tex": tex}]
+                )
+                expect(matrix.dtype.name).to(equal("int32"))
+                expect(matrix.tolist()).to(equal([[3, 6], [6, 3]]))
+
+    with description("solve()"):
+        with context("workers is given"):
+            with it("solve the independent blocks separately"):
+                parser = Parser(
+                    vartype="SPIN",
+                    variables=[
+                        {"dimension": 2, "size": [3, 4], "symbol": "s", "type": "SPIN"}
+                    ],
+                    constants=[
+                        {"symbol": "D", "values": 3},
+                        {"symbol": "J", "values": 4},
+                    ],
+                )
+                # the spins of each row sum up to 0
+                row = {
+                    "fn": "sum",
+                    "sub": {"fn": "equal", "arg": [{"sym": "j"}, {"num": 1}]},
+                    "sup": {"sym": "J"},
+                    "arg": [
+                        {
+                            "sym": "s",
+                            "sub": {"fn": "list", "arg": [{"sym": "d"}, {"sym": "j"}]},
+                        }
+                    ],
+                }
+                tex = {
+                    "fn": "sum",
+                    "sub": {"fn": "equal", "arg": [{"sym": "d"}, {"num": 1}]},
+                    "sup": {"sym": "D"},
+                    "arg": [{"fn": "add", "arg": [row], "sup": {"num": 2}}],
+                }
+                decoded, _, energy = parser.solve(
+                    objectives=[{"label": "obj", "weight": 1, "tex": tex}],
+                    num_reads=20,
+                    workers=2,
+                )
+                expect(energy).to(equal(0.0))
+                expect([sum(decoded["s"][d].values()) for d in range(3)]).to(
+                    equal([0, 0, 0])
+                )
+
+        with context("workers is not positive"):
+            with it("raise ParserInitArgumentsError"):
+                tex = {"sym": "x", "sub": {"num": 1}}
+                objectives = [{"label": "obj", "weight": 1, "tex": tex}]
+                expect(lambda: self.parser.solve(objectives=objectives, workers=0)).to(
+                    raise_error(ParserInitArgumentsError)
+                )
+
+        with context("time_limit is given"):
+            with before.each:
+                self.objectives = [
+                    {
+                        "label": "obj",
+                        "weight": 1,
+                        "tex": {
+                            "fn": "subtract",
+                            "arg": [
+                                {"sym": "x", "sub": {"num": 1}},
+                                {"sym": "x", "sub": {"num": 2}},
+                            ],
+                            "sup": {"num": 2},
+                        },
+                    }
+                ]
+
+            with it("stop when the target energy is reached"):
+                energies = []
+                result = self.parser.solve(
+                    objectives=self.objectives,
+                    time_limit=10,
+                    target_energy=0,
+                    callback=lambda decoded, broken, energy: energies.append(energy),
+                )
+                expect(result[2]).to(equal(0.0))
+                expect(energies).to(equal([0.0]))
+
+            with it("stop when the energy does not improve"):
+                start = time.perf_counter()
+                results = list(
+                    self.parser.solve_iter(
+                        objectives=self.objectives, time_limit=10, patience=2
+                    )
+                )
+                expect(time.perf_counter() - start < 10).to(equal(True))
+                expect([energy for _, _, energy in results]).to(equal([0.0]))
+
+            with it("stop before a batch which would exceed the time limit"):
+                results = list(
+                    self.parser.solve_iter(objectives=self.objectives, time_limit=0)
+                )
+                expect(len(results)).to(equal(1))
+
+            with it("raise ParserInitArgumentsError w/ workers"):
+                expect(
+                    lambda: self.parser.solve(
+                        objectives=self.objectives, time_limit=1, workers=2
+                    )
+                ).to(raise_error(ParserInitArgumentsError))
+
+        with context("stop conditions are given w/o time_limit"):
+            with it("raise ParserInitArgumentsError"):
+                tex = {"sym": "x", "sub": {"num": 1}}
+                objectives = [{"label": "obj", "weight": 1, "tex": tex}]
+                for options in [
+                    {"target_energy": 0},
+                    {"patience": 1},
+                    {"callback": print},
+                ]:
+                    expect(
+                        lambda: self.parser.solve(objectives=objectives, **options)
+                    ).to(raise_error(ParserInitArgumentsError))
@@ -0,0 +1,88 @@
+import numpy as np
+from expects import be_true, expect, raise_error
+from expects.matchers.built_in.equal import equal
+from mamba import before, context, description, it
+from mathjson2qubo.errors import CalculationError
+from mathjson2qubo.model import Model
+from pyqubo import Array
+
+with description("Model") as self:
+    with before.each:
+        x = Array.create("x", 4, "BINARY")
+        rng = np.random.RandomState(0)
+        H = 3.0 + sum(
+            float(rng.randn()) * x[i] * x[j] for i in range(4) for j in range(i, 4)
+        )
+        model = H.compile()
+        self.qubo, self.qubo_const, self.qubo_label = Model.make_model_from_tuple(
+            model.to_qubo()
+        )
+        self.ising, self.ising_const, self.ising_label = Model.make_model_from_tuple(
+            model.to_ising()
+        )
+
+    with description("qubo_to_ising()"):
+        with it("return the same matrix and offset as to_ising()"):
+            matrix, const = Model.qubo_to_ising(self.qubo, self.qubo_const)
+            expect(self.qubo_label).to(equal(self.ising_label))
+            expect(bool(np.allclose(matrix, self.ising))).to(be_true)
+            expect(bool(np.isclose(const, self.ising_const))).to(be_true)
+
+        with it("does not modify the argument"):
+            qubo = self.qubo.copy()
+            Model.qubo_to_ising(self.qubo, self.qubo_const)
+            expect(bool(np.array_equal(qubo, self.qubo))).to(be_true)
+
+    with description("ising_to_qubo()"):
+        with it("return the same matrix and offset as to_qubo()"):
+            matrix, const = Model.ising_to_qubo(self.ising, self.ising_const)
+            expect(bool(np.allclose(matrix, self.qubo))).to(be_true)
+            expect(bool(np.isclose(const, self.qubo_const))).to(be_true)
+
+    with description("make_model_from_tuple()"):
+        with context("dtype is float32"):
+            with it("return the matrix of float32"):
+                matrix, _, _ = Model.make_model_from_tuple(
+                    ({("a", "b"): 1.5, ("a", "a"): -2.0}, 0.0), dtype="float32"
+                )
+                expect(matrix.dtype.name).to(equal("float32"))
+                expect(matrix.tolist()).to(equal([[-2.0, 1.5], [1.5, 0.0]]))
+
+        with context("dtype is int32 and coefficients are integer"):
+            with it("return the matrix of int32"):
+                matrix, _, _ = Model.make_model_from_tuple(
+                    ({("a", "b"): 0.1 * 30, ("a", "a"): -2.0}, 0.0), dtype="int32"
+                )
+                expect(matrix.dtype.name).to(equal("int32"))
+                expect(matrix.tolist()).to(equal([[-2, 3], [3, 0]]))
+
+        with context("dtype is int32 and a coefficient is not integer"):
+            with it("raise CalculationError"):
+                expect(
+                    lambda: Model.make_model_from_tuple(
+                        ({("a", "b"): 1.5}, 0.0), dtype="int32"
+                    )
+                ).to(raise_error(CalculationError))
+
+        with context("coefficient overflows dtype"):
+            with it("raise CalculationError"):
+                expect(
+                    lambda: Model.make_model_from_tuple(
+                        ({("a", "b"): 2.0**31}, 0.0), dtype="int32"
+                    )
+                ).to(raise_error(CalculationError))
+
+    with description("make_tuple_from_model()"):
+        with it("return the inverse of make_model_from_tuple()"):
+            labels = sorted(self.qubo_label, key=self.qubo_label.get)
+            qubo, const = Model.make_tuple_from_model(
+                self.qubo, self.qubo_const, labels
+            )
+            matrix, _, _ = Model.make_model_from_tuple((qubo, const))
+            expect(bool(np.array_equal(matrix, self.qubo))).to(be_true)
+
+            linear, quad, const = Model.make_tuple_from_model(
+                self.ising, self.ising_const, labels, "SPIN"
+            )
+            matrix, _, _ = Model.make_model_from_tuple((linear, quad, const))
+            expect(bool(np.array_equal(matrix, self.ising))).to(be_true)
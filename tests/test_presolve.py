@@ -0,0 +1,91 @@
+import itertools
+
+import numpy as np
+from expects import be_true, expect
+from expects.matchers.built_in.equal import equal
+from mamba import context, description, it
+from mathjson2qubo.parser import Parser
+from mathjson2qubo.presolve import reduce_model, restore_solution
+
+
+def _energy(matrix, values, const=0.0):
+    diagonal = matrix.diagonal()
+    return (
+        diagonal @ values + 0.5 * values @ (matrix - np.diag(diagonal)) @ values + const
+    )
+
+
+def _minimize(matrix, const, domain):
+    return min(
+        (_energy(matrix, np.array(bits, dtype=float), const), bits)
+        for bits in itertools.product(domain, repeat=len(matrix))
+    )
+
+
+with description("reduce_model()"):
+    with context("variables decided by their bounds"):
+        with it("fix the variables and split the rest into components"):
+            # x0 = 1 is forced, x1 only couples with x0, x2 and x3 are frustrated
+            matrix = np.array(
+                [
+                    [-5.0, 1.0, 0.0, 0.0],
+                    [1.0, -2.0, 0.0, 0.0],
+                    [0.0, 0.0, -1.0, 3.0],
+                    [0.0, 0.0, 3.0, -1.0],
+                ]
+            )
+            labels = {"x[0]": 0, "x[1]": 1, "x[2]": 2, "x[3]": 3}
+            reduction = reduce_model(matrix, 2.0, labels)
+            expect(reduction.fixed).to(equal({"x[0]": 1, "x[1]": 1}))
+            expect(reduction.offset).to(equal(-4.0))
+            expect([c.labels for c in reduction.components]).to(
+                equal([["x[2]", "x[3]"]])
+            )
+
+    with context("random models"):
+        with it("keep the optimal energy and restore all labels"):
+            rng = np.random.RandomState(0)
+            for vartype, domain in (("BINARY", (0, 1)), ("SPIN", (-1, 1))):
+                for _ in range(20):
+                    n = 6
+                    matrix = np.triu(np.round(rng.randn(n, n) * 2))
+                    matrix *= rng.rand(n, n) < 0.4
+                    matrix += np.triu(matrix, 1).T
+                    labels = {"x[{}]".format(i): i for i in range(n)}
+                    reduction = reduce_model(matrix, 1.0, labels, vartype)
+
+                    energy, solutions = reduction.offset, []
+                    for component in reduction.components:
+                        e, bits = _minimize(component.matrix, 0.0, domain)
+                        energy += e
+                        solutions.append(dict(zip(component.labels, bits)))
+                    solution = restore_solution(reduction, solutions)
+                    values = np.array([solution[label] for label in labels])
+
+                    optimum, _ = _minimize(matrix, 1.0, domain)
+                    expect(bool(np.isclose(energy, optimum))).to(be_true)
+                    expect(bool(np.isclose(_energy(matrix, values, 1.0), optimum))).to(
+                        be_true
+                    )
+
+
+with description("Parser.presolve()"):
+    with it("reduce the matrix of the model"):
+        parser = Parser(
+            vartype="BINARY",
+            variables=[{"dimension": 1, "size": 3, "symbol": "x", "type": "BINARY"}],
+        )
+        tex = {
+            "fn": "add",
+            "arg": [
+                {"fn": "negate", "arg": [{"sym": "x", "sub": {"num": 1}}]},
+                {"sym": "x", "sub": {"num": 2}},
+                {"sym": "x", "sub": {"num": 3}},
+            ],
+        }
+        reduction = parser.presolve(
+            objectives=[{"label": "obj", "weight": 1, "tex": tex}]
+        )
+        expect(reduction.fixed).to(equal({"x[0]": 1, "x[1]": 0, "x[2]": 0}))
+        expect(reduction.offset).to(equal(-1.0))
+        expect(reduction.components).to(equal([]))
@@ -0,0 +1,381 @@
+import subprocess
+import sys
+
+from expects import expect, raise_error
+from expects.matchers.built_in.equal import equal
+from mamba import before, context, description, it
+from mathjson2qubo.errors import MathJsonValidationError, ParserInitArgumentsError
+from mathjson2qubo.validator import Validator
+
+
+def _x(index):
+    return {"sym": "x", "sub": {"sym": index}}
+
+
+with description("mathjson2qubo package") as self:
+    with context("import the package"):
+        with it("does not import pyqubo"):
+            code = "import sys, mathjson2qubo; print('pyqubo' in sys.modules)"
+            output = subprocess.run(
+                [sys.executable, "-c", code], check=True, capture_output=True, text=True
+            ).stdout.strip()
+            expect(output).to(equal("False"))
+
+        with it("does not import pyqubo to look up an unknown attribute"):
+            code = (
+                "import sys, mathjson2qubo\n"
+                "print(hasattr(mathjson2qubo, 'nonexistent'), 'pyqubo' in sys.modules)"
+            )
+            output = subprocess.run(
+                [sys.executable, "-c", code], check=True, capture_output=True, text=True
+            ).stdout.strip()
+            expect(output).to(equal("False False"))
+
+        with it("does not expose the internals of the lazy modules"):
+            import mathjson2qubo
+
+            expect(hasattr(mathjson2qubo, "np")).to(equal(False))
+            expect(mathjson2qubo.Parser.__name__).to(equal("Parser"))
+
+with description("Validator") as self:
+    with before.each:
+        self.validator = Validator(
+            variables=[{"dimension": 1, "size": 4, "symbol": "x", "type": "BINARY"}],
+            constants=[{"symbol": "N", "values": 4}],
+        )
+
+    with description("__init__()"):
+        with context("call w/o variables"):
+            with it("raise ParserInitArgumentsError"):
+                expect(lambda: Validator(variables=[])).to(
+                    raise_error(ParserInitArgumentsError)
+                )
+
+        with context("call with variable whose dimension is 1 and size is list"):
+            with it("raise ParserInitArgumentsError"):
+                expect(
+                    lambda: Validator(
+                        variables=[
+                            {"symbol": "x", "dimension": 1, "size": [2], "type": "SPIN"}
+                        ]
+                    )
+                ).to(raise_error(ParserInitArgumentsError))
+
+        with context("call with integer variable whose upper is not larger than lower"):
+            with it("raise ParserInitArgumentsError"):
+                variable = {"symbol": "n", "dimension": 0, "size": 0, "type": "INTEGER"}
+                variable.update({"lower": 3, "upper": 3})
+                expect(lambda: Validator(variables=[variable])).to(
+                    raise_error(ParserInitArgumentsError)
+                )
+
+        with context("call with integer variable of unknown encoding"):
+            with it("raise ParserInitArgumentsError"):
+                variable = {"symbol": "n", "dimension": 0, "size": 0, "type": "INTEGER"}
+                variable.update({"upper": 3, "encoding": "gray"})
+                expect(lambda: Validator(variables=[variable])).to(
+                    raise_error(ParserInitArgumentsError)
+                )
+
+    with description("check_mathjson()"):
+        with context("valid mathjson"):
+            with it("return no errors"):
+                arg = {
+                    "fn": "sum",
+                    "sub": {"fn": "equal", "arg": [{"sym": "i"}, {"num": 1}]},
+                    "sup": {"sym": "N"},
+                    "arg": [{"sym": "x", "sub": {"sym": "i"}}],
+                }
+                expect(self.validator.check_mathjson(arg)).to(equal([]))
+
+        with context("object has none of sym, num, fn"):
+            with it("return 2001 error"):
+                errors = self.validator.check_mathjson({"x": 1})
+                expect([(p, e.code) for p, e in errors]).to(equal([("$", 2001)]))
+
+        with context("unknown function"):
+            with it("return 2002 error"):
+                arg = {"fn": "power", "arg": [{"num": 1}]}
+                errors = self.validator.check_mathjson(arg)
+                expect([(p, e.code) for p, e in errors]).to(equal([("$.fn", 2002)]))
+
+        with context("undefined symbol"):
+            with it("return 3001 error"):
+                arg = {"sym": "y", "sub": {"num": 1}}
+                errors = self.validator.check_mathjson(arg)
+                expect([(p, e.code) for p, e in errors]).to(equal([("$", 3001)]))
+
+        with context("index symbol used outside of the sum"):
+            with it("return 3001 error"):
+                arg = {
+                    "fn": "add",
+                    "arg": [
+                        {
+                            "fn": "sum",
+                            "sub": {"fn": "equal", "arg": [{"sym": "i"}, {"num": 1}]},
+                            "sup": {"sym": "N"},
+                            "arg": [{"sym": "x", "sub": {"sym": "i"}}],
+                        },
+                        {"sym": "x", "sub": {"sym": "i"}},
+                    ],
+                }
+                errors = self.validator.check_mathjson(arg)
+                expect([(p, e.code) for p, e in errors]).to(
+                    equal([("$.arg[1].sub", 3001)])
+                )
+
+        with context("sum w/o sup"):
+            with it("return 4001 error"):
+                arg = {
+                    "fn": "sum",
+                    "sub": {"fn": "equal", "arg": [{"sym": "i"}, {"num": 1}]},
+                    "arg": [{"sym": "x", "sub": {"sym": "i"}}],
+                }
+                errors = self.validator.check_mathjson(arg)
+                expect([(p, e.code) for p, e in errors]).to(equal([("$", 4001)]))
+
+        with context("multi-index sum"):
+            with it("bind all indices"):
+                arg = {
+                    "fn": "sum",
+                    "sub": {
+                        "fn": "list",
+                        "arg": [
+                            {"fn": "equal", "arg": [{"sym": "i"}, {"num": 1}]},
+                            {"fn": "equal", "arg": [{"sym": "j"}, {"num": 1}]},
+                        ],
+                    },
+                    "sup": {"fn": "list", "arg": [{"sym": "N"}, {"sym": "N"}]},
+                    "arg": [
+                        {"fn": "multiply", "arg": [_x("i"), _x("j")]},
+                    ],
+                }
+                expect(self.validator.check_mathjson(arg)).to(equal([]))
+
+            with it("return 4007 error if sub and sup have different lengths"):
+                arg = {
+                    "fn": "sum",
+                    "sub": {
+                        "fn": "list",
+                        "arg": [
+                            {"fn": "equal", "arg": [{"sym": "i"}, {"num": 1}]},
+                            {"fn": "equal", "arg": [{"sym": "j"}, {"num": 1}]},
+                        ],
+                    },
+                    "sup": {"sym": "N"},
+                    "arg": [_x("i")],
+                }
+                errors = self.validator.check_mathjson(arg)
+                expect([(p, e.code) for p, e in errors]).to(equal([("$.sup", 4007)]))
+
+        with context("sum over index set"):
+            with before.each:
+                self.validator = Validator(
+                    variables=[
+                        {"dimension": 1, "size": 4, "symbol": "x", "type": "BINARY"}
+                    ],
+                    constants=[
+                        {"symbol": "E", "values": [[1, 2], [3, 4]]},
+                        {"symbol": "w", "values": [[0, 1], [1, 0]]},
+                    ],
+                )
+
+            with it("bind the indices"):
+                arg = {
+                    "fn": "sum",
+                    "sub": {
+                        "fn": "elementof",
+                        "arg": [
+                            {"fn": "list", "arg": [{"sym": "i"}, {"sym": "j"}]},
+                            {"fn": "support", "arg": [{"sym": "w"}]},
+                        ],
+                    },
+                    "arg": [{"fn": "multiply", "arg": [_x("i"), _x("j")]}],
+                }
+                expect(self.validator.check_mathjson(arg)).to(equal([]))
+
+            with it("return 4008 error if the domain is a variable"):
+                arg = {
+                    "fn": "sum",
+                    "sub": {"fn": "elementof", "arg": [{"sym": "i"}, {"sym": "x"}]},
+                    "arg": [_x("i")],
+                }
+                errors = self.validator.check_mathjson(arg)
+                expect([(p, e.code) for p, e in errors]).to(
+                    equal([("$.sub.arg[1]", 4008)])
+                )
+
+            with it("return 3002 error if an index of the list is below 1"):
+                validator = Validator(
+                    variables=[
+                        {"dimension": 1, "size": 4, "symbol": "x", "type": "BINARY"}
+                    ],
+                    constants=[{"symbol": "F", "values": [[0, 1], [1, 2]]}],
+                )
+                arg = {
+                    "fn": "sum",
+                    "sub": {
+                        "fn": "elementof",
+                        "arg": [
+                            {"fn": "list", "arg": [{"sym": "i"}, {"sym": "j"}]},
+                            {"sym": "F"},
+                        ],
+                    },
+                    "arg": [_x("i")],
+                }
+                errors = validator.check_mathjson(arg)
+                expect([(p, e.code) for p, e in errors]).to(
+                    equal([("$.sub.arg[1]", 3002)])
+                )
+
+            with it("return 4009 error if the number of indices does not match"):
+                arg = {
+                    "fn": "sum",
+                    "sub": {"fn": "elementof", "arg": [{"sym": "i"}, {"sym": "E"}]},
+                    "arg": [_x("i")],
+                }
+                errors = self.validator.check_mathjson(arg)
+                expect([(p, e.code) for p, e in errors]).to(
+                    equal([("$.sub.arg[0]", 4009)])
+                )
+
+            with it("return 2001 error if an element is not an object"):
+                cases = [
+                    ([{"sym": "i"}, "z"], [("$.sub.arg[1]", 2001)]),
+                    (["i", {"sym": "E"}], [("$.sub.arg[0]", 2001)]),
+                    (
+                        [{"sym": "i"}, {"fn": "support", "arg": [1]}],
+                        [("$.sub.arg[1].arg[0]", 4008)],
+                    ),
+                ]
+                for elements, expected in cases:
+                    arg = {
+                        "fn": "sum",
+                        "sub": {"fn": "elementof", "arg": elements},
+                        "arg": [{"num": 1}],
+                    }
+                    errors = self.validator.check_mathjson(arg)
+                    expect([(p, e.code) for p, e in errors]).to(equal(expected))
+
+        with context("superscript which can not be folded"):
+            with it("return errors instead of raising"):
+                cases = [
+                    ({"sym": "N", "sup": {"num": 2000}}, []),
+                    ({"num": 0, "sup": {"num": -1}}, [("$", 5001)]),
+                    ({"num": 2, "sup": {"num": "inf"}}, [("$.sup", 7002)]),
+                    ({"num": 2, "sup": {"num": "nan"}}, [("$.sup", 7002)]),
+                ]
+                for arg, expected in cases:
+                    errors = self.validator.check_mathjson(arg)
+                    expect([(p, e.code) for p, e in errors]).to(equal(expected))
+
+        with context("multiple errors"):
+            with it("return all errors with paths"):
+                arg = {
+                    "fn": "add",
+                    "arg": [
+                        {
+                            "fn": "sum",
+                            "sub": {"fn": "equal", "arg": [{"sym": "i"}, {"num": 1.5}]},
+                            "sup": {"sym": "x", "sub": {"num": 1}},
+                            "arg": [{"sym": "x", "sub": {"sym": "i"}}],
+                        },
+                        {"sym": "x", "sub": {"num": 5}},
+                        {"sym": "x", "sub": {"num": 1}, "sup": {"num": 3}},
+                        {"fn": "divide", "arg": [{"num": 1}, {"num": 0}]},
+                    ],
+                }
+                errors = self.validator.check_mathjson(arg)
+                expect([(p, e.code) for p, e in errors]).to(
+                    equal(
+                        [
+                            ("$.arg[0].sub.arg[1]", 4005),
+                            ("$.arg[0].sup", 4006),
+                            ("$.arg[1].sub", 3002),
+                            ("$.arg[2].sup", 7003),
+                            ("$.arg[3].arg[1]", 5001),
+                        ]
+                    )
+                )
+
+    with description("validate()"):
+        with context("invalid terms"):
+            with it("raise MathJsonValidationError with paths of all terms"):
+                objectives = [{"label": "obj", "weight": 1, "tex": {"sym": "y"}}]
+                constraints = [{"label": "c", "weight": 1, "tex": {"num": "G"}}]
+                try:
+                    self.validator.validate(objectives, constraints)
+                except MathJsonValidationError as e:
+                    errors = e.errors
+                expect([(p, e.code) for p, e in errors]).to(
+                    equal(
+                        [
+                            ("$.objectives[0].tex", 3001),
+                            ("$.constraints[0].tex.num", 2004),
+                        ]
+                    )
+                )
+
+        with context("inequality constraint"):
+            with it("check both sides"):
+                constraints = [
+                    {
+                        "label": "c",
+                        "weight": 1,
+                        "tex": {"fn": "lessequal", "arg": [{"num": 1}, {"sym": "y"}]},
+                    },
+                    {
+                        "label": "d",
+                        "weight": 1,
+                        "tex": {"fn": "greaterequal", "arg": []},
+                    },
+                ]
+                try:
+                    self.validator.validate([], constraints)
+                except MathJsonValidationError as e:
+                    errors = e.errors
+                expect([(p, e.code) for p, e in errors]).to(
+                    equal(
+                        [
+                            ("$.constraints[0].tex.arg[1]", 3001),
+                            ("$.constraints[1].tex.arg", 2005),
+                        ]
+                    )
+                )
+
+        with context("inequality objective"):
+            with it("raise MathJsonValidationError"):
+                objectives = [
+                    {
+                        "label": "obj",
+                        "weight": 1,
+                        "tex": {"fn": "lessequal", "arg": [_x(1), {"num": 1}]},
+                    }
+                ]
+                expect(lambda: self.validator.validate(objectives)).to(
+                    raise_error(MathJsonValidationError)
+                )
+
+    with description("validate_mathjson()"):
+        with context("invalid mathjson"):
+            with it("raise MathJsonValidationError"):
+                expect(lambda: self.validator.validate_mathjson({"sym": "y"})).to(
+                    raise_error(MathJsonValidationError)
+                )
+
+        with context("validate w/o pyqubo"):
+            with it("does not import pyqubo"):
+                code = (
+                    "import sys\n"
+                    "from mathjson2qubo import Validator\n"
+                    "Validator([{'symbol': 'x', 'dimension': 0, 'size': 0, 'type': 'SPIN'}])"
+                    ".validate_mathjson({'sym': 'x'})\n"
+                    "print('pyqubo' in sys.modules)"
+                )
+                output = subprocess.run(
+                    [sys.executable, "-c", code],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout.strip()
+                expect(output).to(equal("False"))